@@ -17,8 +17,6 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from src.evaluation import evaluate_all, results_to_table
-
 
 def main():
     parser = argparse.ArgumentParser(description="Evaluate retrieval runs.")
@@ -30,8 +28,13 @@ def main():
     parser.add_argument("--dlhard-qrels", default=None,
                         help="Path to DL-HARD qrels file.")
     parser.add_argument("--output", default=None, help="Output CSV path.")
+    parser.add_argument("--legacy-trec-eval", action="store_true",
+                        help="Shell out to pyserini.eval.trec_eval instead of "
+                             "evaluating in-process (parity checks).")
     args = parser.parse_args()
 
+    from src.evaluation import evaluate_all, results_to_table
+
     qrels_overrides = {}
     if args.dlhard_qrels:
         qrels_overrides["dlhard"] = args.dlhard_qrels
@@ -41,6 +44,7 @@ def main():
         datasets=args.datasets,
         retrievers=args.retrievers,
         qrels_overrides=qrels_overrides,
+        legacy_trec_eval=args.legacy_trec_eval,
     )
 
     table = results_to_table(results, output_path=args.output)
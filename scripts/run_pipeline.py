@@ -18,21 +18,12 @@ python scripts/run_pipeline.py \
 """
 
 import argparse
-import json
+import math
 import sys
 from pathlib import Path
 
-import yaml
-
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from src.llm_client import LLMClient
-from src.prompts import PromptBank
-from src.methods import get_method
-from src.data import load_queries_tsv, save_queries_tsv, DATASETS
-from src.retrieval import run_retrieval, retrieve_contexts_for_queries
-from src.evaluation import evaluate, results_to_table
-
 
 def main():
     parser = argparse.ArgumentParser(description="Full reproducibility pipeline.")
@@ -45,9 +36,28 @@ def main():
                         help="Directory with query TSV files named {dataset}.tsv")
     parser.add_argument("--output-dir", default=None, help="Override output directory.")
     parser.add_argument("--dlhard-qrels", default=None, help="Path to DL-HARD qrels.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit all LLM calls through the OpenAI Batch API "
+                             "(offline, discounted; may take up to 24h).")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not read or write the on-disk LLM response and "
+                             "context caches.")
+    parser.add_argument("--legacy-trec-eval", action="store_true",
+                        help="Evaluate via the trec_eval CLI instead of in-process.")
     args = parser.parse_args()
 
-    cfg = yaml.safe_load(open(args.config))
+    # Imported after argument parsing so that --help and usage errors
+    # return without loading the LLM, retrieval and evaluation stacks.
+    from src.config import load_config
+    from src.llm_client import LLMClient
+    from src.prompts import PromptBank
+    from src.methods import get_method
+    from src.data import load_queries_tsv, save_queries_tsv, DATASETS
+    from src.retrieval import run_retrieval_many, retrieve_contexts_for_queries
+    from src.evaluation import evaluate
+    from src import fastjson
+
+    cfg = load_config(args.config)
 
     methods = args.methods or list(cfg.get("methods", {}).keys())
     llms = args.llms or [cfg.get("llm", {}).get("model", "gpt-4.1")]
@@ -58,7 +68,17 @@ def main():
     ret_cfg = cfg.get("retrieval", {})
     ctx_cfg = cfg.get("context_retrieval", {})
 
+    # Results are checkpointed to a JSONL file as they are computed, so an
+    # interrupted sweep resumes without re-evaluating finished runs.
+    out_root.mkdir(parents=True, exist_ok=True)
+    results_file = out_root / "all_results.json"
+    checkpoint_file = results_file.with_suffix(".jsonl")
     all_results = {}
+    if checkpoint_file.exists():
+        for record in fastjson.iter_jsonl(checkpoint_file):
+            all_results[record["key"]] = record["metrics"]
+        print(f"Resuming with {len(all_results)} results from {checkpoint_file}")
+        fastjson.terminate_jsonl(checkpoint_file)
 
     for llm_name in llms:
         print(f"\n{'='*70}")
@@ -69,6 +89,9 @@ def main():
             model_name=llm_name,
             max_tokens=cfg.get("llm", {}).get("max_tokens", 256),
             temperature=cfg.get("llm", {}).get("temperature", 0.0),
+            concurrency=cfg.get("llm", {}).get("concurrency", 16),
+            always_cache=cfg.get("llm", {}).get("always_cache", False),
+            cache_dir=None if args.no_cache else out_root / ".llm_cache",
         )
         prompts = PromptBank(prompts_path)
 
@@ -91,12 +114,14 @@ def main():
                 # Update dataset tag for methods that use dataset-specific
                 # prompts (e.g. LameR selects lamer_{dataset} templates).
                 if "dataset" in method_params:
-                    method_params["dataset"] = ds
-                    method = method_cls(llm=llm, prompts=prompts, params=method_params)
+                    method.set_dataset(ds)
 
                 # ── Step 1: Reformulate ─────────────────────────────────
                 reform_dir = out_root / llm_name / method_name
                 reform_file = reform_dir / f"{ds}.tsv"
+                # fresh reformulations are searched from memory; cached
+                # ones are read back from their TSV
+                retrieval_queries = reform_file
 
                 if not reform_file.exists():
                     ctx_map = None
@@ -106,14 +131,25 @@ def main():
                         ctx_map = retrieve_contexts_for_queries(
                             queries_file, ds,
                             k=ctx_k, threads=ctx_threads,
+                            cache_dir=None if args.no_cache else out_root / ".ctx_cache",
+                        )
+                    # finished queries survive an interrupted run here
+                    partial = reform_file.with_suffix(".partial.jsonl")
+                    if args.batch:
+                        results = method.reformulate_batch_api(queries, ctx_map=ctx_map)
+                    else:
+                        results = method.reformulate_batch(
+                            queries, ctx_map=ctx_map, resume_path=partial,
                         )
-                    results = method.reformulate_batch(queries, ctx_map=ctx_map)
                     save_queries_tsv(results, reform_file)
+                    partial.unlink(missing_ok=True)
+                    retrieval_queries = [(r.qid, r.reformulated) for r in results]
                 else:
                     print(f"      [CACHED] {reform_file}")
 
                 # ── Step 2: Retrieve ────────────────────────────────────
                 run_dir = reform_dir / "runs"
+                jobs = {}
                 for ret in retrievers:
                     run_file = run_dir / f"{ds}.{ret}.run"
                     if run_file.exists():
@@ -124,23 +160,29 @@ def main():
                     remove_query = False
                     if ret == "bge":
                         query_prefix = "Represent this sentence for searching relevant passages:"
-                        if DATASETS.get(ds, {}).get("group") == "beir":
+                        if ds in DATASETS and DATASETS[ds].group == "beir":
                             remove_query = True
 
+                    jobs[ret] = dict(
+                        queries_tsv=retrieval_queries,
+                        dataset=ds,
+                        retriever=ret,
+                        output_run=run_file,
+                        hits=ret_cfg.get("hits", 1000),
+                        threads=ret_cfg.get("threads", 16),
+                        batch_size=ret_cfg.get("batch_size", 512),
+                        remove_query=remove_query,
+                        query_prefix=query_prefix,
+                    )
+
+                # Retrievers search different indexes (BM25 in-process, the
+                # others in their own Pyserini process), so they run
+                # concurrently.
+                if jobs:
                     try:
-                        run_retrieval(
-                            queries_tsv=reform_file,
-                            dataset=ds,
-                            retriever=ret,
-                            output_run=run_file,
-                            hits=ret_cfg.get("hits", 1000),
-                            threads=ret_cfg.get("threads", 16),
-                            batch_size=ret_cfg.get("batch_size", 512),
-                            remove_query=remove_query,
-                            query_prefix=query_prefix,
-                        )
+                        run_retrieval_many(list(jobs.values()))
                     except Exception as e:
-                        print(f"      [ERROR] {ret}: {e}")
+                        print(f"      [ERROR] {e}")
 
                 # ── Step 3: Evaluate ────────────────────────────────────
                 for ret in retrievers:
@@ -148,24 +190,32 @@ def main():
                     if not run_file.exists():
                         continue
 
+                    key = f"{llm_name}/{method_name}/{ds}/{ret}"
+                    if key in all_results:
+                        print(f"      [CACHED] {key}")
+                        continue
+
                     qrels = None
                     if ds == "dlhard" and args.dlhard_qrels:
                         qrels = args.dlhard_qrels
 
                     try:
-                        metrics = evaluate(run_file, ds, qrels_path=qrels)
-                        key = f"{llm_name}/{method_name}/{ds}/{ret}"
+                        metrics = evaluate(
+                            run_file, ds, qrels_path=qrels,
+                            legacy_trec_eval=args.legacy_trec_eval,
+                        )
                         all_results[key] = metrics
+                        # failed (NaN) evaluations are retried on resume
+                        if all(math.isfinite(v) for v in metrics.values()):
+                            with open(checkpoint_file, "ab") as f:
+                                f.write(fastjson.dumps({"key": key, "metrics": metrics}) + b"\n")
                         metric_str = "  ".join(f"{k}={v:.4f}" for k, v in metrics.items())
                         print(f"      [{ret.upper()}] {metric_str}")
                     except Exception as e:
                         print(f"      [ERROR] eval {ret}: {e}")
 
     # ── Save consolidated results ───────────────────────────────────────
-    results_file = out_root / "all_results.json"
-    results_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(results_file, "w") as f:
-        json.dump(all_results, f, indent=2)
+    fastjson.dump_file(all_results, results_file)
     print(f"\nAll results saved to {results_file}")
 
 
@@ -18,17 +18,9 @@ import argparse
 import sys
 from pathlib import Path
 
-import yaml
-
 # allow importing from src/
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from src.llm_client import LLMClient
-from src.prompts import PromptBank
-from src.methods import get_method
-from src.data import load_queries_tsv, save_queries_tsv
-from src.retrieval import retrieve_contexts_for_queries
-
 
 def main():
     parser = argparse.ArgumentParser(description="Run LLM-based query reformulation.")
@@ -44,18 +36,37 @@ def main():
                              "Required for csqe and lamer.")
     parser.add_argument("--max-tokens", type=int, default=None, help="Override max output tokens.")
     parser.add_argument("--temperature", type=float, default=None, help="Override temperature.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not read or write the on-disk LLM response and "
+                             "context caches.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit all LLM calls through the OpenAI Batch API "
+                             "(offline, discounted; may take up to 24h).")
     args = parser.parse_args()
 
+    # Imported after argument parsing so that --help and usage errors
+    # return without loading the LLM and retrieval stacks.
+    from src.config import load_config
+    from src.llm_client import LLMClient
+    from src.prompts import PromptBank
+    from src.methods import get_method
+    from src.data import load_queries_tsv, save_queries_tsv
+    from src.retrieval import retrieve_contexts_for_queries
+
     # ── Load config ─────────────────────────────────────────────────────
-    cfg = yaml.safe_load(open(args.config))
+    cfg = load_config(args.config)
     method_params = cfg.get("methods", {}).get(args.method, {})
 
     # ── Initialise LLM client ───────────────────────────────────────────
     llm_cfg = cfg.get("llm", {})
+    cache_dir = Path(cfg.get("paths", {}).get("output", "outputs")) / ".llm_cache"
     llm = LLMClient(
         model_name=args.llm,
         max_tokens=args.max_tokens or llm_cfg.get("max_tokens", 256),
         temperature=args.temperature if args.temperature is not None else llm_cfg.get("temperature", 0.0),
+        concurrency=llm_cfg.get("concurrency", 16),
+        always_cache=llm_cfg.get("always_cache", False),
+        cache_dir=None if args.no_cache else cache_dir,
     )
 
     # ── Load prompts ────────────────────────────────────────────────────
@@ -65,10 +76,10 @@ def main():
     # ── Instantiate method ──────────────────────────────────────────────
     # Inject the dataset name so methods with dataset-specific prompts
     # (e.g. LameR) select the correct template automatically.
-    if "dataset" in method_params:
-        method_params["dataset"] = args.dataset
     method_cls = get_method(args.method)
     method = method_cls(llm=llm, prompts=prompts, params=method_params)
+    if "dataset" in method_params:
+        method.set_dataset(args.dataset)
 
     # ── Load queries ────────────────────────────────────────────────────
     queries = load_queries_tsv(args.queries)
@@ -85,13 +96,21 @@ def main():
         ctx_map = retrieve_contexts_for_queries(
             args.queries, args.dataset, retriever=retriever,
             k=ctx_k, threads=ctx_threads,
+            cache_dir=None if args.no_cache else cache_dir.parent / ".ctx_cache",
         )
 
     # ── Reformulate ─────────────────────────────────────────────────────
-    results = method.reformulate_batch(queries, ctx_map=ctx_map)
+    # Finished queries are checkpointed next to the output, so a re-run
+    # after an interruption only reformulates the rest.
+    partial = Path(args.output).with_suffix(".partial.jsonl")
+    if args.batch:
+        results = method.reformulate_batch_api(queries, ctx_map=ctx_map)
+    else:
+        results = method.reformulate_batch(queries, ctx_map=ctx_map, resume_path=partial)
 
     # ── Save ────────────────────────────────────────────────────────────
     save_queries_tsv(results, args.output)
+    partial.unlink(missing_ok=True)
     print(f"Saved {len(results)} reformulated queries → {args.output}")
 
 
@@ -14,12 +14,8 @@ import argparse
 import sys
 from pathlib import Path
 
-import yaml
-
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from src.retrieval import run_retrieval
-
 
 def main():
     parser = argparse.ArgumentParser(description="Run retrieval with Pyserini.")
@@ -33,9 +29,14 @@ def main():
     parser.add_argument("--batch-size", type=int, default=512)
     args = parser.parse_args()
 
+    from src.data import DATASETS
+    from src.retrieval import run_retrieval_many
+
     out = Path(args.output_dir)
     out.mkdir(parents=True, exist_ok=True)
 
+    # all retrievers are run concurrently
+    jobs = []
     for ret in args.retrievers:
         run_file = out / f"{args.dataset}.{ret}.run"
 
@@ -45,11 +46,10 @@ def main():
         if ret == "bge":
             query_prefix = "Represent this sentence for searching relevant passages:"
             # BEIR datasets use --remove-query
-            from src.data import DATASETS
-            if DATASETS.get(args.dataset, {}).get("group") == "beir":
+            if args.dataset in DATASETS and DATASETS[args.dataset].group == "beir":
                 remove_query = True
 
-        run_retrieval(
+        jobs.append(dict(
             queries_tsv=args.queries,
             dataset=args.dataset,
             retriever=ret,
@@ -59,7 +59,9 @@ def main():
             batch_size=args.batch_size,
             remove_query=remove_query,
             query_prefix=query_prefix,
-        )
+        ))
+
+    run_retrieval_many(jobs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+"""OpenAI Batch API client for offline reformulation runs.
+
+Batch jobs are billed at half the synchronous price and draw on a separate
+rate-limit quota, at the cost of completing asynchronously (within 24h).
+See :meth:`BaseMethod.reformulate_batch_api` for how method calls are
+collected into batches.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from .llm_client import LLMClient
+
+
+class BatchLLMClient:
+    """Submit chat-completion requests as Batch API jobs.
+
+    Parameters
+    ----------
+    llm : LLMClient
+        Client whose model, defaults and OpenAI connection are used.
+        Only the ``"openai"`` provider supports the Batch API.
+    """
+
+    def __init__(self, llm: LLMClient):
+        if llm.provider != "openai":
+            raise ValueError(f"Batch API is not available for provider '{llm.provider}'.")
+        self.llm = llm
+
+    def make_request(
+        self,
+        custom_id: str,
+        messages: List[Dict[str, str]],
+        *,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        n: int = 1,
+    ) -> Dict[str, Any]:
+        """Build one Batch API request line for a chat completion."""
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.llm.model_id,
+                "messages": messages,
+                "temperature": temperature if temperature is not None else self.llm.temperature,
+                "max_tokens": max_tokens if max_tokens is not None else self.llm.max_tokens,
+                "n": n,
+            },
+        }
+
+    def submit_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """Upload ``requests`` (see :meth:`make_request`) as a JSONL file
+        and create a Batch API job.  Returns the batch id."""
+        client = self.llm.client
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".jsonl", encoding="utf-8", delete=False,
+        ) as f:
+            for req in requests:
+                f.write(json.dumps(req) + "\n")
+            path = f.name
+        try:
+            with open(path, "rb") as f:
+                input_file = client.files.create(file=f, purpose="batch")
+        finally:
+            os.unlink(path)
+
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        print(f"  [BATCH] submitted {batch.id} ({len(requests)} requests)")
+        return batch.id
+
+    def collect(
+        self,
+        batch_id: str,
+        poll_interval: float = 30.0,
+        max_interval: float = 600.0,
+    ) -> Dict[str, List[str]]:
+        """Poll a batch until it finishes and return ``custom_id → choices``.
+
+        Polling backs off exponentially from ``poll_interval`` up to
+        ``max_interval`` seconds.  Requests that failed inside a completed
+        batch are omitted from the result.
+        """
+        client = self.llm.client
+        wait = poll_interval
+        while True:
+            batch = client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'.")
+            print(f"  [BATCH] {batch_id} is {batch.status}, checking again in {wait:.0f}s …")
+            time.sleep(wait)
+            wait = min(max_interval, wait * 2)
+
+        responses: Dict[str, List[str]] = {}
+        if batch.output_file_id is None:
+            return responses
+        content = client.files.content(batch.output_file_id).text
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            responses[record["custom_id"]] = [
+                c["message"]["content"].strip() for c in response["body"]["choices"]
+            ]
+        return responses
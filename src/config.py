@@ -0,0 +1,27 @@
+"""Experiment config loading."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+
+def load_config(path: str | Path) -> Dict[str, Any]:
+    """Load an experiment YAML config.
+
+    Uses libyaml's C loader when PyYAML was built with it.
+
+    Parameters
+    ----------
+    path : str | Path
+        Path to the YAML config (e.g. ``configs/default.yaml``).
+    """
+    with open(path, encoding="utf-8") as f:
+        return yaml.load(f, Loader=_SafeLoader) or {}
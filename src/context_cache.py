@@ -0,0 +1,68 @@
+"""On-disk cache for retrieved contexts of corpus-grounded methods.
+
+Top-k passage texts are stored in a SQLite database keyed on a hash of
+everything that determines them (index, BM25 weights, k, query text), so
+repeated context retrieval for the same queries skips Lucene entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+# SQLite's default limit on host parameters per statement is 999
+_LOOKUP_CHUNK = 500
+
+
+class ContextCache:
+    """Persistent ``key → list[str]`` store for retrieved passage texts.
+
+    Parameters
+    ----------
+    cache_dir : str | Path
+        Directory holding the ``ctx_cache.sqlite`` database.
+    """
+
+    def __init__(self, cache_dir: str | Path):
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / "ctx_cache.sqlite"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS contexts (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(index_name: str, k1: float, b: float, k: int, query: str) -> str:
+        """Hash the retrieval parameters and query text into a cache key."""
+        payload = json.dumps([index_name, k1, b, k, query], ensure_ascii=False)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[str]]:
+        """Return the cached contexts for whichever of ``keys`` are present."""
+        found: Dict[str, List[str]] = {}
+        with self._lock:
+            for i in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[i:i + _LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM contexts WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def set_many(self, items: Iterable[Tuple[str, List[str]]]) -> None:
+        """Store ``(key, contexts)`` pairs in one transaction."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO contexts (key, value) VALUES (?, ?)",
+                ((key, json.dumps(value, ensure_ascii=False)) for key, value in items),
+            )
+            self._conn.commit()
@@ -2,19 +2,29 @@
 
 from __future__ import annotations
 
+import functools
 import json
+import os
+import re
+import statistics
 import subprocess
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .data import DATASETS
 
+# A trec_eval summary line, e.g. "ndcg_cut_10   all   0.7123"
+_TREC_RE = re.compile(r"^(\S+)\s+all\s+(\S+)\s*$", re.M)
+
 
 def evaluate(
     run_file: str | Path,
     dataset: str,
     qrels_path: Optional[str | Path] = None,
     metrics: Optional[List[str]] = None,
+    legacy_trec_eval: bool = False,
 ) -> Dict[str, float]:
     """Evaluate a TREC-format run file against qrels.
 
@@ -29,6 +39,9 @@ def evaluate(
     metrics : list[str], optional
         Override which metrics to compute (pytrec_eval names, e.g.
         ``["ndcg_cut_10", "recall_100"]``).
+    legacy_trec_eval : bool
+        If True, shell out to ``pyserini.eval.trec_eval`` instead of
+        evaluating in-process (useful for parity checks).
 
     Returns
     -------
@@ -38,51 +51,234 @@ def evaluate(
     ds_cfg = DATASETS[dataset]
 
     if qrels_path is None:
-        qrels = ds_cfg["qrels"]
+        qrels = ds_cfg.qrels
     else:
         qrels = str(qrels_path)
 
     if metrics is None:
-        metrics = ds_cfg["eval_metrics"]
+        metrics = list(ds_cfg.eval_metrics)
+
+    trec_args = list(ds_cfg.trec_args)
+
+    trec_metrics = [_to_trec_measure(m) for m in metrics]
+
+    if legacy_trec_eval:
+        return _evaluate_trec_eval(run_file, qrels, metrics, trec_metrics, trec_args)
+
+    complete, relevance_level = _parse_trec_args(trec_args)
+    qrels_dict = _load_qrels(qrels)
 
-    trec_args = ds_cfg.get("trec_args", ["-c"])
+    if all(_is_vectorized_measure(m) for m in trec_metrics):
+        per_q = _evaluate_vectorized(run_file, qrels_dict, trec_metrics, relevance_level)
+    else:
+        import pytrec_eval
+
+        evaluator = pytrec_eval.RelevanceEvaluator(
+            qrels_dict, set(trec_metrics), relevance_level=relevance_level,
+        )
+        per_q = evaluator.evaluate(_load_run(run_file))
+
+    # ``-c``: average over every judged query, scoring missing ones as 0
+    qids = list(qrels_dict) if complete else list(per_q)
 
     results: Dict[str, float] = {}
-    for metric in metrics:
-        # pytrec_eval uses dots: ndcg_cut.10 / recall.100
-        trec_metric = metric.replace("_", ".", 1) if "_" in metric else metric
-
-        cmd = [
-            "python", "-m", "pyserini.eval.trec_eval",
-        ] + trec_args + [
-            "-m", trec_metric,
-            qrels,
-            str(run_file),
-        ]
-
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-        if proc.returncode != 0:
-            print(f"  [WARN] evaluation for {trec_metric} failed: {proc.stderr[:300]}")
-            results[metric] = float("nan")
+    for m in metrics:
+        if not qids:
+            results[m] = float("nan")
             continue
+        results[m] = statistics.fmean(per_q.get(q, {}).get(m, 0.0) for q in qids)
+    return results
 
-        # Parse the last numeric value from trec_eval output
-        for line in proc.stdout.strip().splitlines():
-            parts = line.split()
-            if len(parts) >= 3 and parts[1] == "all":
-                try:
-                    results[metric] = float(parts[2])
-                except ValueError:
-                    pass
+
+def _is_vectorized_measure(measure: str) -> bool:
+    """Whether :func:`_evaluate_vectorized` implements ``measure``."""
+    name, _, cutoff = measure.partition(".")
+    return name in ("ndcg_cut", "recall") and cutoff.isdigit()
+
+
+def _evaluate_vectorized(
+    run_file: str | Path,
+    qrels: Dict[str, Dict[str, int]],
+    trec_metrics: List[str],
+    relevance_level: int = 1,
+) -> Dict[str, Dict[str, float]]:
+    """Compute ``ndcg_cut.k`` / ``recall.k`` per query with NumPy.
+
+    The run is ranked the way trec_eval does it (score descending, ties
+    broken by docid descending) and gathered into a padded
+    ``(num_queries, depth)`` relevance matrix, so every metric is a single
+    matrix product or row-sum.  Gains are linear in the relevance grade,
+    as in trec_eval.  Returns the same ``{qid: {metric: value}}`` shape as
+    ``pytrec_eval.RelevanceEvaluator.evaluate``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    cutoffs = [int(m.partition(".")[2]) for m in trec_metrics]
+    depth = max(cutoffs)
+
+    df = _load_run_frame(run_file)
+    df = df[df["qid"].isin(qrels.keys())]
+    df = df.sort_values(
+        ["qid", "score", "docid"], ascending=[True, False, False], kind="mergesort",
+    )
+    df["pos"] = df.groupby("qid", sort=False).cumcount()
+    df = df[df["pos"] < depth]
+
+    judged = pd.DataFrame(
+        [(q, d, r) for q, docs in qrels.items() for d, r in docs.items()],
+        columns=["qid", "docid", "rel"],
+    )
+    df = df.merge(judged, on=["qid", "docid"], how="left")
+    codes, qids = pd.factorize(df["qid"])
+
+    rel = np.zeros((len(qids), depth), dtype=np.int32)
+    rel[codes, df["pos"].to_numpy()] = df["rel"].fillna(0).to_numpy(dtype=np.int32)
+
+    ideal = np.zeros_like(rel)
+    num_rel = np.zeros(len(qids))
+    for i, qid in enumerate(qids):
+        grades = sorted((r for r in qrels[qid].values() if r > 0), reverse=True)[:depth]
+        ideal[i, :len(grades)] = grades
+        num_rel[i] = sum(r >= relevance_level for r in qrels[qid].values())
+
+    discounts = 1.0 / np.log2(np.arange(2, depth + 2))
+    gains = np.clip(rel, 0, None)
+
+    values: Dict[str, "np.ndarray"] = {}
+    for measure, k in zip(trec_metrics, cutoffs):
+        if measure.startswith("ndcg_cut"):
+            dcg = gains[:, :k] @ discounts[:k]
+            idcg = ideal[:, :k] @ discounts[:k]
+            out = np.divide(dcg, idcg, out=np.zeros_like(dcg), where=idcg > 0)
+        else:
+            hits = (rel[:, :k] >= relevance_level).sum(axis=1)
+            out = np.divide(hits, num_rel, out=np.zeros(len(qids)), where=num_rel > 0)
+        values[measure.replace(".", "_")] = out
+
+    return {
+        qid: {m: float(v[i]) for m, v in values.items()}
+        for i, qid in enumerate(qids)
+    }
+
+
+def _evaluate_trec_eval(
+    run_file: str | Path,
+    qrels: str,
+    metrics: List[str],
+    trec_metrics: List[str],
+    trec_args: List[str],
+) -> Dict[str, float]:
+    """Evaluate via the ``pyserini.eval.trec_eval`` CLI (one JVM per call)."""
+    # trec_eval accepts repeated -m flags, so all metrics share one process
+    cmd = ["python", "-m", "pyserini.eval.trec_eval"] + trec_args
+    for m in trec_metrics:
+        cmd += ["-m", m]
+    cmd += [qrels, str(run_file)]
+
+    results: Dict[str, float] = {}
+    proc = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+    if proc.returncode != 0:
+        print(f"  [WARN] evaluation of {run_file} failed: {proc.stderr[:300]}")
+        return {m: float("nan") for m in metrics}
+
+    for name, value in _TREC_RE.findall(proc.stdout):
+        if name in metrics:
+            try:
+                results[name] = float(value)
+            except ValueError:
+                pass
 
     return results
 
 
+def _to_trec_measure(metric: str) -> str:
+    """Map a result key to its measure name: ``ndcg_cut_10`` → ``ndcg_cut.10``."""
+    base, _, cutoff = metric.rpartition("_")
+    return f"{base}.{cutoff}" if base and cutoff.isdigit() else metric
+
+
+def _parse_trec_args(trec_args: List[str]) -> Tuple[bool, int]:
+    """Translate the trec_eval flags we use (``-c``, ``-l N``) into
+    ``(complete, relevance_level)`` for pytrec_eval."""
+    complete = "-c" in trec_args
+    relevance_level = 1
+    if "-l" in trec_args:
+        relevance_level = int(trec_args[trec_args.index("-l") + 1])
+    return complete, relevance_level
+
+
+def _load_qrels(qrels: str) -> Dict[str, Dict[str, int]]:
+    """Load qrels from a TREC qrels file or a Pyserini qrels name.
+
+    Parsed judgments are memoised per process on ``(path, mtime)``, so
+    evaluating several runs of one dataset in the same process reads the
+    file only once (:func:`evaluate_all` hands each worker all runs of a
+    dataset for this reason), while edits to a qrels file still
+    invalidate the cache.
+    """
+    if os.path.exists(qrels):
+        path = qrels
+    else:
+        from pyserini.search import get_qrels_file
+        path = get_qrels_file(qrels)
+    return _parse_qrels(path, os.path.getmtime(path))
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_qrels(path: str, mtime: float) -> Dict[str, Dict[str, int]]:
+    qrels_dict: Dict[str, Dict[str, int]] = defaultdict(dict)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 4:
+                continue
+            qrels_dict[parts[0]][parts[2]] = int(parts[3])
+    return dict(qrels_dict)
+
+
+def _load_run_frame(run_file: str | Path):
+    """Bulk-parse a TREC run file into a DataFrame.
+
+    Columns: ``qid`` (str), ``docid`` (str), ``rank`` (uint32) and
+    ``score`` (float64).  Uses pandas' C tokenizer, which is much faster
+    than splitting ~millions of lines in Python.
+    """
+    import pandas as pd
+
+    try:
+        return pd.read_csv(
+            run_file,
+            sep=r"\s+",
+            header=None,
+            names=["qid", "q0", "docid", "rank", "score", "tag"],
+            usecols=["qid", "docid", "rank", "score"],
+            dtype={"qid": str, "docid": str, "rank": "uint32", "score": "float64"},
+            engine="c",
+        )
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame(
+            {"qid": [], "docid": [], "rank": [], "score": []}
+        ).astype({"qid": str, "docid": str, "rank": "uint32", "score": "float64"})
+
+
+def _load_run(run_file: str | Path) -> Dict[str, Dict[str, float]]:
+    """Load a TREC run file into ``{qid: {docid: score}}``."""
+    df = _load_run_frame(run_file)
+    docids = df["docid"].to_numpy()
+    scores = df["score"].to_numpy()
+    return {
+        qid: dict(zip(docids[idx].tolist(), scores[idx].tolist()))
+        for qid, idx in df.groupby("qid", sort=False).indices.items()
+    }
+
+
 def evaluate_all(
     run_dir: str | Path,
     datasets: Optional[List[str]] = None,
     retrievers: Optional[List[str]] = None,
     qrels_overrides: Optional[Dict[str, str]] = None,
+    legacy_trec_eval: bool = False,
 ) -> Dict[str, Dict[str, Dict[str, float]]]:
     """Batch-evaluate all run files in a directory.
 
@@ -98,20 +294,66 @@ def evaluate_all(
     retrievers = retrievers or ["bm25", "splade", "bge"]
     qrels_overrides = qrels_overrides or {}
 
-    all_results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    all_results: Dict[str, Dict[str, Dict[str, float]]] = {ds: {} for ds in datasets}
 
+    jobs = []
     for ds in datasets:
-        all_results[ds] = {}
         for ret in retrievers:
             run_file = run_dir / f"{ds}.{ret}.run"
-            if not run_file.exists():
-                continue
-            qrels = qrels_overrides.get(ds)
-            all_results[ds][ret] = evaluate(run_file, ds, qrels_path=qrels)
+            if run_file.exists():
+                jobs.append((ds, ret, run_file, qrels_overrides.get(ds)))
+
+    if not jobs:
+        return all_results
+
+    # The trec_eval CLI path is bound on JVM start-up, so every run gets
+    # its own thread.
+    if legacy_trec_eval:
+        with ThreadPoolExecutor(max_workers=min(32, len(jobs))) as ex:
+            futures = {
+                ex.submit(
+                    evaluate, run_file, ds, qrels_path=qrels, legacy_trec_eval=True,
+                ): (ds, ret)
+                for ds, ret, run_file, qrels in jobs
+            }
+            for fut in as_completed(futures):
+                ds, ret = futures[fut]
+                all_results[ds][ret] = fut.result()
+        return all_results
+
+    # In-process evaluation is CPU-bound, so it fans out over processes.
+    # Each worker takes all runs of one dataset, so the dataset's qrels
+    # are parsed once (the qrels cache is per process); parallelism is
+    # therefore capped by the number of datasets.
+    by_dataset: Dict[str, List[Tuple[str, Path]]] = defaultdict(list)
+    for ds, ret, run_file, _ in jobs:
+        by_dataset[ds].append((ret, run_file))
+
+    with ProcessPoolExecutor(
+        max_workers=min(len(by_dataset), os.cpu_count() or 1)
+    ) as ex:
+        futures = {
+            ex.submit(_evaluate_dataset, ds, runs, qrels_overrides.get(ds)): ds
+            for ds, runs in by_dataset.items()
+        }
+        for fut in as_completed(futures):
+            all_results[futures[fut]].update(fut.result())
 
     return all_results
 
 
+def _evaluate_dataset(
+    dataset: str,
+    runs: List[Tuple[str, Path]],
+    qrels_path: Optional[str | Path],
+) -> Dict[str, Dict[str, float]]:
+    """Evaluate ``(retriever, run_file)`` pairs of one dataset in-process."""
+    return {
+        ret: evaluate(run_file, dataset, qrels_path=qrels_path)
+        for ret, run_file in runs
+    }
+
+
 def results_to_table(results: Dict, output_path: Optional[str | Path] = None) -> str:
     """Format nested evaluation results as a readable table and optionally
     save as CSV.
@@ -128,31 +370,25 @@ def results_to_table(results: Dict, output_path: Optional[str | Path] = None) ->
     str
         Human-readable table string.
     """
-    import csv
-    import io
-
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-
-    # collect all metrics
-    all_metrics = set()
-    for ds_dict in results.values():
-        for ret_dict in ds_dict.values():
-            all_metrics.update(ret_dict.keys())
-    all_metrics = sorted(all_metrics)
-
-    # header
-    header = ["Dataset", "Retriever"] + all_metrics
-    writer.writerow(header)
-
-    for ds in sorted(results.keys()):
-        for ret in sorted(results[ds].keys()):
-            row = [ds, ret] + [
-                f"{results[ds][ret].get(m, float('nan')):.4f}" for m in all_metrics
-            ]
-            writer.writerow(row)
-
-    table = buf.getvalue()
+    import pandas as pd
+
+    rows = [
+        (ds, ret, metric, value)
+        for ds, ds_dict in results.items()
+        for ret, ret_dict in ds_dict.items()
+        for metric, value in ret_dict.items()
+    ]
+    df = pd.DataFrame(rows, columns=["Dataset", "Retriever", "metric", "value"])
+    table_df = df.pivot(index=["Dataset", "Retriever"], columns="metric", values="value")
+
+    # keep (dataset, retriever) pairs that have no metrics at all
+    pairs = [(ds, ret) for ds in sorted(results) for ret in sorted(results[ds])]
+    table_df = table_df.reindex(
+        index=pd.MultiIndex.from_tuples(pairs, names=["Dataset", "Retriever"]),
+        columns=sorted(table_df.columns),
+    )
+
+    table = table_df.to_csv(float_format="%.4f", na_rep="nan", lineterminator="\r\n")
 
     if output_path:
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,59 @@
+"""JSON helpers that use ``orjson`` when it is installed.
+
+``orjson`` is optional; without it the standard library is used and the
+output is equivalent.  Note that ``orjson`` writes NaN as ``null``.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialise ``obj`` to UTF-8 JSON bytes (2-space indent if ``indent``)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_file(obj: Any, path: str | Path, indent: bool = True) -> None:
+    """Write ``obj`` as a JSON document to ``path``."""
+    with open(path, "wb") as f:
+        f.write(dumps(obj, indent=indent))
+
+
+def iter_jsonl(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """Yield records from a JSONL file, skipping blank or truncated lines
+    (e.g. the last line of a file whose writer was killed)."""
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                continue
+
+
+def terminate_jsonl(path: str | Path) -> None:
+    """End a JSONL file with a newline, so records appended after an
+    interrupted write start on a line of their own."""
+    with open(path, "rb+") as f:
+        if f.seek(0, 2) > 0:
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
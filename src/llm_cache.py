@@ -0,0 +1,68 @@
+"""Content-addressed on-disk cache for LLM completions.
+
+Completions are stored in a SQLite database keyed on a hash of everything
+that determines the response (model, messages, temperature, max_tokens,
+n), so re-runs and duplicate prompts are served without an API call.
+SQLite is safe to share between threads and concurrent processes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class LLMCache:
+    """Persistent ``key → list[str]`` store for chat completions.
+
+    Parameters
+    ----------
+    cache_dir : str | Path
+        Directory holding the ``llm_cache.sqlite`` database.
+    """
+
+    def __init__(self, cache_dir: str | Path):
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / "llm_cache.sqlite"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        model_id: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        n: int,
+    ) -> str:
+        """Hash the request parameters into a cache key."""
+        payload = json.dumps(
+            [model_id, messages, temperature, max_tokens, n],
+            sort_keys=True, ensure_ascii=False,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: List[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value) VALUES (?, ?)",
+                (key, json.dumps(value, ensure_ascii=False)),
+            )
+            self._conn.commit()
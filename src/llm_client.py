@@ -2,12 +2,43 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
+import random
 import time
-from typing import List, Optional, Dict, Any
+import warnings
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple
 
-from openai import OpenAI
+from openai import (
+    DEFAULT_CONNECTION_LIMITS,
+    APIConnectionError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+)
 
+from .llm_cache import LLMCache
+
+
+# Errors worth retrying; anything else (bad request, auth, …) is raised at
+# once.  APIConnectionError also covers timeouts.
+_TRANSIENT_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+# Longest wait before a retry, in seconds
+_MAX_RETRY_WAIT = 60.0
+
+# Clients shared by every LLMClient with the same endpoint, API key and
+# pool size, so a sweep over methods reuses one set of warm connections:
+# ``(base_url, api_key, max_connections) → client``.  Async connections
+# belong to the event loop that opened them, so async clients are also
+# keyed on the running loop.
+_SYNC_CLIENTS: Dict[Tuple[Optional[str], str, int], OpenAI] = {}
+_ASYNC_CLIENTS: Dict[
+    Tuple[Optional[str], str, int, asyncio.AbstractEventLoop], AsyncOpenAI
+] = {}
 
 # ── Model presets ────────────────────────────────────────────────────────────
 
@@ -36,6 +67,20 @@ class LLMClient:
         Default sampling temperature.
     max_retries : int
         Number of retries on transient errors.
+    concurrency : int
+        Default maximum number of queries reformulated concurrently
+        (see :meth:`BaseMethod.areformulate_batch`).
+    cache_dir : str | Path, optional
+        If given, deterministic (temperature 0) completions are cached on
+        disk under this directory and replayed on identical requests.
+    always_cache : bool
+        Also cache sampled (temperature > 0) completions, so that a re-run
+        replays exactly the same samples.
+    max_connections : int
+        Size of the async HTTP connection pool.  All pooled connections
+        are kept alive, so bursts of concurrent requests reuse open
+        connections instead of repeatedly re-handshaking.  Instances with
+        the same provider, API key and pool size share one pool.
     """
 
     def __init__(
@@ -44,6 +89,10 @@ class LLMClient:
         max_tokens: int = 256,
         temperature: float = 0.0,
         max_retries: int = 3,
+        concurrency: int = 16,
+        cache_dir: Optional[str | Path] = None,
+        max_connections: int = 200,
+        always_cache: bool = False,
     ):
         cfg = LLM_CONFIGS.get(model_name, {"provider": "openai", "model_id": model_name})
         self.model_id = cfg["model_id"]
@@ -51,6 +100,10 @@ class LLMClient:
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.max_retries = max_retries
+        self.concurrency = concurrency
+        self.cache = LLMCache(cache_dir) if cache_dir else None
+        self.always_cache = always_cache
+        self.max_connections = max_connections
 
         if self.provider == "openrouter":
             api_key = os.environ.get("OPENROUTER_API_KEY", "")
@@ -59,7 +112,48 @@ class LLMClient:
             api_key = os.environ.get("OPENAI_API_KEY", "")
             base_url = None  # default OpenAI endpoint
 
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self._api_key = api_key
+        self._base_url = base_url
+        self._pool_key = (base_url, api_key, max_connections)
+        self.client = _SYNC_CLIENTS.get(self._pool_key)
+        if self.client is None:
+            self.client = _SYNC_CLIENTS[self._pool_key] = OpenAI(api_key=api_key, base_url=base_url)
+
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """The async client shared within the running event loop, created
+        on first use in each loop."""
+        key = (*self._pool_key, asyncio.get_running_loop())
+        client = _ASYNC_CLIENTS.get(key)
+        if client is None:
+            # forget clients of loops that ended without aclose()
+            for stale in [k for k in _ASYNC_CLIENTS if k[-1].is_closed()]:
+                del _ASYNC_CLIENTS[stale]
+            client = _ASYNC_CLIENTS[key] = self._make_async_client()
+        return client
+
+    def _make_async_client(self) -> AsyncOpenAI:
+        # the Limits class of whichever HTTP library this openai build uses
+        limits = type(DEFAULT_CONNECTION_LIMITS)(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+        return AsyncOpenAI(
+            api_key=self._api_key,
+            base_url=self._base_url,
+            http_client=DefaultAsyncHttpxClient(limits=limits),
+        )
+
+    async def aclose(self) -> None:
+        """Close the running event loop's shared async client.
+
+        Pooled connections belong to the event loop that opened them, so
+        this should be awaited before that loop ends.  A fresh client is
+        created on next use.
+        """
+        client = _ASYNC_CLIENTS.pop((*self._pool_key, asyncio.get_running_loop()), None)
+        if client is not None:
+            await client.close()
 
     # ── public helpers ───────────────────────────────────────────────────
 
@@ -82,7 +176,9 @@ class LLMClient:
         max_tokens : int, optional
             Override default max_tokens for this call.
         n : int
-            Number of completions to return (uses the API ``n`` parameter).
+            Number of completions to return (uses the API ``n`` parameter,
+            so the prompt is sent and billed once).  Providers that return
+            fewer choices are topped up with extra requests.
 
         Returns
         -------
@@ -91,29 +187,169 @@ class LLMClient:
         """
         temp = temperature if temperature is not None else self.temperature
         mtok = max_tokens if max_tokens is not None else self.max_tokens
+        _check_sampling(n, temp)
+
+        key = self._cache_key(messages, temp, mtok, n)
+        if key is not None and (hit := self.cache.get(key)) is not None:
+            return hit
+
+        result = self._create(messages, temp, mtok, n)
+        if len(result) < n:
+            # provider ignored ``n``: fetch the missing completions one by one
+            for _ in range(n - len(result)):
+                result += self._create(messages, temp, mtok, 1)
+        if key is not None:
+            self.cache.set(key, result)
+        return result
+
+    def generate_one(
+        self,
+        messages: List[Dict[str, str]],
+        **kwargs,
+    ) -> str:
+        """Convenience wrapper that returns a single completion string."""
+        return self.generate(messages, n=1, **kwargs)[0]
+
+    async def agenerate(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        n: int = 1,
+    ) -> List[str]:
+        """Async counterpart of :meth:`generate`, using ``AsyncOpenAI``."""
+        temp = temperature if temperature is not None else self.temperature
+        mtok = max_tokens if max_tokens is not None else self.max_tokens
+        _check_sampling(n, temp)
+
+        key = self._cache_key(messages, temp, mtok, n)
+        if key is not None and (hit := self.cache.get(key)) is not None:
+            return hit
+
+        result = await self._acreate(messages, temp, mtok, n)
+        if len(result) < n:
+            # provider ignored ``n``: fetch the missing completions one by one
+            extra = await asyncio.gather(*(
+                self._acreate(messages, temp, mtok, 1) for _ in range(n - len(result))
+            ))
+            result += [c for choices in extra for c in choices]
+        if key is not None:
+            self.cache.set(key, result)
+        return result
+
+    async def agenerate_one(
+        self,
+        messages: List[Dict[str, str]],
+        **kwargs,
+    ) -> str:
+        """Async counterpart of :meth:`generate_one`."""
+        return (await self.agenerate(messages, n=1, **kwargs))[0]
+
+    # ── API calls with retries ───────────────────────────────────────────
 
+    def _create(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        n: int,
+    ) -> List[str]:
         for attempt in range(1, self.max_retries + 1):
             try:
                 resp = self.client.chat.completions.create(
                     model=self.model_id,
                     messages=messages,
-                    temperature=temp,
-                    max_tokens=mtok,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
                     n=n,
                 )
                 return [c.message.content.strip() for c in resp.choices]
-            except Exception as exc:
+            except _TRANSIENT_ERRORS as exc:
                 if attempt == self.max_retries:
                     raise
-                wait = 2 ** attempt
-                print(f"  [LLM] attempt {attempt} failed ({exc}), retrying in {wait}s …")
+                wait = _retry_wait(attempt, exc)
+                print(f"  [LLM] attempt {attempt} failed ({exc}), retrying in {wait:.1f}s …")
                 time.sleep(wait)
 
-    def generate_one(
+    async def _acreate(
         self,
         messages: List[Dict[str, str]],
-        **kwargs,
-    ) -> str:
-        """Convenience wrapper that returns a single completion string."""
-        return self.generate(messages, n=1, **kwargs)[0]
+        temperature: float,
+        max_tokens: int,
+        n: int,
+    ) -> List[str]:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                resp = await self.aclient.chat.completions.create(
+                    model=self.model_id,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    n=n,
+                )
+                return [c.message.content.strip() for c in resp.choices]
+            except _TRANSIENT_ERRORS as exc:
+                if attempt == self.max_retries:
+                    raise
+                wait = _retry_wait(attempt, exc)
+                print(f"  [LLM] attempt {attempt} failed ({exc}), retrying in {wait:.1f}s …")
+                await asyncio.sleep(wait)
+
+    # ── response cache ───────────────────────────────────────────────────
+
+    def _cache_key(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        n: int,
+    ) -> Optional[str]:
+        """Cache key for a request, or None if it must not be cached.
+
+        Sampled (temperature > 0) requests are not cached unless
+        ``always_cache`` is set, since replaying them would change the
+        method's output distribution.
+        """
+        if self.cache is None or (temperature > 0 and not self.always_cache):
+            return None
+        return LLMCache.make_key(self.model_id, messages, temperature, max_tokens, n)
+
+    def lookup_cached(self, body: Dict[str, Any]) -> Optional[List[str]]:
+        """Return cached completions for a Batch API request body, if any."""
+        key = self._cache_key(body["messages"], body["temperature"], body["max_tokens"], body["n"])
+        return self.cache.get(key) if key is not None else None
+
+    def store_cached(self, body: Dict[str, Any], result: List[str]) -> None:
+        """Cache completions obtained for a Batch API request body."""
+        key = self._cache_key(body["messages"], body["temperature"], body["max_tokens"], body["n"])
+        if key is not None:
+            self.cache.set(key, result)
+
+
+def _retry_wait(attempt: int, exc: Exception) -> float:
+    """Seconds to wait before retry number ``attempt``.
+
+    Honours the server's ``Retry-After`` header when present (capped at
+    60 s, so a bogus value cannot stall the client); otherwise uses
+    exponential backoff (1, 2, 4, … capped at 60 s) plus up to 1 s of
+    random jitter, so concurrent requests do not all retry at once.
+    """
+    response = getattr(exc, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        try:
+            if retry_after is not None:
+                return min(_MAX_RETRY_WAIT, max(0.0, float(retry_after)))
+        except ValueError:
+            pass  # HTTP-date form: fall back to backoff
+    return min(_MAX_RETRY_WAIT, 2 ** (attempt - 1)) + random.uniform(0, 1)
+
 
+def _check_sampling(n: int, temperature: float) -> None:
+    if n > 1 and temperature == 0:
+        warnings.warn(
+            "Requesting several completions at temperature 0; they will be "
+            "(near-)identical.  Set a method 'temperature' param to sample.",
+            stacklevel=3,
+        )
@@ -2,23 +2,33 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+import asyncio
+import copy
+import re
+import sys
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
 
-from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 
+from .. import fastjson
+from ..batch_llm_client import BatchLLMClient
 from ..llm_client import LLMClient
 from ..prompts import PromptBank
 
+_WS_RE = re.compile(r"\s+")
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Query:
     """A single query with its id and text."""
     qid: str
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ReformulatedQuery:
     """Output of a reformulation method."""
     qid: str
@@ -30,7 +40,8 @@ class ReformulatedQuery:
 class BaseMethod:
     """Abstract base for all reformulation methods.
 
-    Subclasses must implement :meth:`reformulate_query`.
+    Subclasses must implement :meth:`areformulate_query`; independent LLM
+    calls within a query should be issued together with ``asyncio.gather``.
 
     Parameters
     ----------
@@ -44,6 +55,9 @@ class BaseMethod:
 
     NAME: str = "base"
     REQUIRES_CONTEXTS: bool = False
+    # Default queries per LLM call (``batch_size`` param).  Values > 1 are
+    # only valid for methods that implement :meth:`areformulate_many`.
+    BATCH_SIZE: int = 1
 
     def __init__(self, llm: LLMClient, prompts: PromptBank, params: Dict[str, Any] | None = None):
         self.llm = llm
@@ -52,7 +66,12 @@ class BaseMethod:
 
     # ── interface ─────────────────────────────────────────────────────────
 
-    def reformulate_query(
+    def set_dataset(self, dataset: str) -> None:
+        """Switch the dataset tag used by dataset-specific prompts
+        (e.g. LameR's ``lamer_{dataset}`` templates)."""
+        self.params["dataset"] = dataset
+
+    async def areformulate_query(
         self,
         query: Query,
         contexts: Optional[List[str]] = None,
@@ -60,25 +79,247 @@ class BaseMethod:
         """Reformulate a single query. Must be overridden by subclasses."""
         raise NotImplementedError
 
+    async def areformulate_many(self, queries: List[Query]) -> List[ReformulatedQuery]:
+        """Reformulate several queries with a single packed LLM call.
+
+        Optional; overridden by single-call methods whose prompt can be
+        applied to a numbered list of queries (see :meth:`_agenerate_packed`).
+        """
+        raise NotImplementedError
+
+    def reformulate_query(
+        self,
+        query: Query,
+        contexts: Optional[List[str]] = None,
+    ) -> ReformulatedQuery:
+        """Blocking wrapper around :meth:`areformulate_query`."""
+        async def run() -> ReformulatedQuery:
+            try:
+                return await self.areformulate_query(query, contexts)
+            finally:
+                await self.llm.aclose()
+
+        return asyncio.run(run())
+
     def reformulate_batch(
         self,
         queries: List[Query],
         ctx_map: Optional[Dict[str, List[str]]] = None,
+        max_concurrency: Optional[int] = None,
+        resume_path: Optional[str | Path] = None,
+    ) -> List[ReformulatedQuery]:
+        """Reformulate a list of queries, showing a progress bar.
+
+        Blocking wrapper around :meth:`areformulate_batch`.
+        """
+        async def run() -> List[ReformulatedQuery]:
+            try:
+                return await self.areformulate_batch(
+                    queries, ctx_map=ctx_map, max_concurrency=max_concurrency,
+                    resume_path=resume_path,
+                )
+            finally:
+                await self.llm.aclose()
+
+        return asyncio.run(run())
+
+    async def areformulate_batch(
+        self,
+        queries: List[Query],
+        ctx_map: Optional[Dict[str, List[str]]] = None,
+        max_concurrency: Optional[int] = None,
+        resume_path: Optional[str | Path] = None,
+    ) -> List[ReformulatedQuery]:
+        """Reformulate queries concurrently.  Results keep the order of
+        ``queries``.
+
+        Duplicate queries (same text and contexts) are reformulated once
+        and the result is copied to every qid.  With a ``batch_size`` param
+        above 1, queries are packed that many per LLM call through
+        :meth:`areformulate_many`.
+
+        Parameters
+        ----------
+        queries : list[Query]
+            Queries to reformulate.
+        ctx_map : dict, optional
+            ``qid → contexts`` for corpus-grounded methods.
+        max_concurrency : int, optional
+            Maximum number of queries in flight.  Defaults to the
+            method's ``max_concurrency`` param, then ``llm.concurrency``.
+        resume_path : path, optional
+            JSONL checkpoint.  Each result is appended as soon as it is
+            finished, and queries already in the file (same qid and text)
+            are not reformulated again, so an interrupted run resumes
+            where it stopped.
+        """
+        if max_concurrency is None:
+            max_concurrency = int(self.params.get("max_concurrency", self.llm.concurrency))
+        sem = asyncio.Semaphore(max_concurrency)
+        ctx_map = ctx_map or {}
+        groups = _group_duplicates(queries, ctx_map)
+        batch_size = int(self.params.get("batch_size", self.BATCH_SIZE))
+        if batch_size > 1 and type(self).areformulate_many is BaseMethod.areformulate_many:
+            raise ValueError(f"Method '{self.NAME}' does not support batch_size > 1.")
+
+        done: Dict[str, ReformulatedQuery] = {}
+        if resume_path is not None and Path(resume_path).exists():
+            for record in fastjson.iter_jsonl(resume_path):
+                done[record["qid"]] = ReformulatedQuery(**record)
+            fastjson.terminate_jsonl(resume_path)
+        unique: List[Optional[ReformulatedQuery]] = [
+            next((done[q.qid] for q in qs if q.qid in done and done[q.qid].original == q.text), None)
+            for qs in groups
+        ]
+        todo = [i for i, rq in enumerate(unique) if rq is None]
+        if done:
+            print(f"  [RESUME] {len(groups) - len(todo)}/{len(groups)} queries from {resume_path}")
+
+        with ExitStack() as stack:
+            ckpt = None
+            if resume_path is not None:
+                Path(resume_path).parent.mkdir(parents=True, exist_ok=True)
+                ckpt = stack.enter_context(open(resume_path, "ab"))
+
+            def save(rq: ReformulatedQuery) -> None:
+                if ckpt is not None:
+                    ckpt.write(fastjson.dumps(asdict(rq)) + b"\n")
+                    ckpt.flush()
+
+            if batch_size > 1:
+                async def run_many(chunk: List[int]) -> None:
+                    async with sem:
+                        part = await self.areformulate_many([groups[i][0] for i in chunk])
+                    for i, rq in zip(chunk, part):
+                        save(rq)
+                        unique[i] = rq
+
+                chunks = [todo[j:j + batch_size] for j in range(0, len(todo), batch_size)]
+                await tqdm_asyncio.gather(
+                    *(run_many(chunk) for chunk in chunks),
+                    desc=self.NAME, unit="batch", **_progress_options(len(chunks)),
+                )
+            else:
+                async def run(i: int) -> None:
+                    q = groups[i][0]
+                    async with sem:
+                        rq = await self.areformulate_query(q, ctx_map.get(q.qid))
+                    save(rq)
+                    unique[i] = rq
+
+                await tqdm_asyncio.gather(
+                    *(run(i) for i in todo),
+                    desc=self.NAME, unit="query", **_progress_options(len(todo)),
+                )
+
+        return _broadcast(queries, groups, unique)
+
+    async def _areformulate_packed(
+        self,
+        prompt_id: str,
+        queries: List[Query],
+        expand: Callable[[Query, str], ReformulatedQuery],
+    ) -> List[ReformulatedQuery]:
+        """Helper for :meth:`areformulate_many`: run one packed call and
+        build each result with ``expand(query, output)``.  Queries the
+        model skipped are reformulated individually."""
+        outputs = await self._agenerate_packed(prompt_id, queries)
+        missing = [q for q, out in zip(queries, outputs) if out is None]
+        redone = iter(await asyncio.gather(*(self.areformulate_query(q) for q in missing)))
+        return [
+            expand(q, out) if out is not None else next(redone)
+            for q, out in zip(queries, outputs)
+        ]
+
+    async def _agenerate_packed(
+        self,
+        prompt_id: str,
+        queries: List[Query],
+    ) -> List[Optional[str]]:
+        """Send ``queries`` as one numbered list through ``prompt_id``.
+
+        The prompt receives ``{queries}`` (``"1. …\\n2. …"``) and
+        ``{count}`` and must ask for a JSON object keyed by query number.
+        ``max_tokens`` is scaled by the number of queries.  Returns one
+        output per query, ``None`` where the answer is missing or the
+        response cannot be parsed.
+        """
+        listing = _numbered([_WS_RE.sub(" ", q.text).strip() for q in queries])
+        msgs = self.prompts.render(prompt_id, queries=listing, count=len(queries))
+        raw = await self.llm.agenerate_one(
+            msgs, max_tokens=self.llm.max_tokens * len(queries),
+        )
+        try:
+            data = _robust_json(raw)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return [None] * len(queries)
+        outputs: List[Optional[str]] = []
+        for i in range(1, len(queries) + 1):
+            value = data.get(str(i))
+            if isinstance(value, list):
+                value = ", ".join(str(v) for v in value)
+            outputs.append(str(value).strip() if value else None)
+        return outputs
+
+    def reformulate_batch_api(
+        self,
+        queries: List[Query],
+        ctx_map: Optional[Dict[str, List[str]]] = None,
+        max_requests_per_batch: int = 50_000,
     ) -> List[ReformulatedQuery]:
-        """Reformulate a list of queries, showing a progress bar."""
-        results: List[ReformulatedQuery] = []
-        for q in tqdm(queries, desc=self.NAME, unit="query"):
-            ctxs = (ctx_map or {}).get(q.qid)
-            results.append(self.reformulate_query(q, ctxs))
-        return results
+        """Reformulate queries through the OpenAI Batch API.
+
+        Each method is replayed against a recording client: every LLM
+        call it would make is collected
+        (``custom_id = "{qid}:{method}:{i}"``) and submitted as one batch,
+        then the method is re-run with those responses.  Methods whose
+        later calls depend on earlier answers (e.g. QA-Expand) simply take
+        one batch round per stage.
+        """
+        batch = BatchLLMClient(self.llm)
+        ctx_map = ctx_map or {}
+        groups = _group_duplicates(queries, ctx_map)
+        responses: Dict[str, List[str]] = {}
+        results: Dict[str, ReformulatedQuery] = {}
+        pending = [qs[0] for qs in groups]
+
+        while pending:
+            requests: List[Dict[str, Any]] = []
+            deferred: List[Query] = []
+            for q in pending:
+                worker = copy.copy(self)
+                worker.llm = _ReplayLLM(
+                    batch, f"{q.qid}:{self.NAME}", responses, requests,
+                )
+                try:
+                    results[q.qid] = worker.reformulate_query(q, ctx_map.get(q.qid))
+                except _Deferred:
+                    deferred.append(q)
+
+            for i in range(0, len(requests), max_requests_per_batch):
+                batch_id = batch.submit_batch(requests[i:i + max_requests_per_batch])
+                responses.update(batch.collect(batch_id))
+            for r in requests:
+                if r["custom_id"] in responses:
+                    self.llm.store_cached(r["body"], responses[r["custom_id"]])
+
+            failed = [r["custom_id"] for r in requests if r["custom_id"] not in responses]
+            if failed:
+                raise RuntimeError(
+                    f"{len(failed)} batch requests failed (e.g. {failed[:5]})."
+                )
+            pending = deferred
+
+        return _broadcast(queries, groups, [results[qs[0].qid] for qs in groups])
 
     # ── query construction helpers ────────────────────────────────────────
 
     @staticmethod
     def concat_repeat(query: str, generated: str, repeats: int = 5) -> str:
         """Return ``(query * repeats) + generated``, whitespace-joined."""
-        parts = [query] * repeats + [generated]
-        return _clean(" ".join(parts))
+        return _clean((query + " ") * repeats + generated)
 
     @staticmethod
     def concat_adaptive(query: str, generated: str, ratio: int = 5) -> str:
@@ -89,20 +330,138 @@ class BaseMethod:
     @staticmethod
     def concat_interleave(query: str, passages: List[str]) -> str:
         """Interleave query between each passage: q p1 q p2 …"""
-        parts = []
-        for p in passages:
-            parts.extend([query, p])
-        return _clean(" ".join(parts))
+        if not passages:
+            return ""
+        return _clean(query + " " + (" " + query + " ").join(passages))
 
 
 def _clean(text: str) -> str:
     """Normalise whitespace and strip stray quotes.
 
-    Tabs are replaced with spaces so the reformulated text is safe for
-    TSV output (qid\\treformulated_query).
+    Every whitespace run (including tabs and line breaks) becomes a single
+    space, so the reformulated text is safe for TSV output
+    (qid\\treformulated_query).
     """
-    text = text.replace("\n", " ").replace("\r", " ").replace("\t", " ")
-    while "  " in text:
-        text = text.replace("  ", " ")
-    return text.strip().strip('"').strip("'")
+    return _WS_RE.sub(" ", text).strip().strip('"').strip("'")
+
+
+def _progress_options(total: int) -> Dict[str, Any]:
+    """tqdm options for batch progress bars.
+
+    Redraws are limited to every 0.5 s and about 200 steps per run, and
+    the bar is turned off when stderr is not a terminal (redirected
+    logs), since fast async completions would otherwise spend time on
+    terminal writes.
+    """
+    return {
+        "mininterval": 0.5,
+        "miniters": max(1, total // 200),
+        "disable": not sys.stderr.isatty(),
+    }
+
+
+def _numbered(items: List[str]) -> str:
+    """Render ``items`` as a numbered list (``"1. …\\n2. …"``), the
+    format used for retrieved contexts and packed queries in prompts."""
+    return "\n".join(f"{i}. {item}" for i, item in enumerate(items, start=1))
+
+
+def _robust_json(text: str) -> Any:
+    """Best-effort JSON extraction from LLM output."""
+    # keep only the body of the first markdown fence, if any
+    start = text.find("```")
+    if start >= 0:
+        end = text.find("```", start + 3)
+        text = text[start + 3:end] if end >= 0 else text[start + 3:]
+        text = text.lstrip()
+        if text.startswith("json"):
+            text = text[4:]
+    return fastjson.loads(text.strip())
+
+
+def _group_duplicates(
+    queries: List[Query],
+    ctx_map: Dict[str, List[str]],
+) -> List[List[Query]]:
+    """Group queries that would produce identical LLM requests.
+
+    Queries are keyed on their stripped text plus their contexts (if any);
+    the first query of each group is the one actually reformulated.
+    """
+    groups: Dict[Any, List[Query]] = {}
+    for q in queries:
+        key = (q.text.strip(), tuple(ctx_map.get(q.qid) or ()))
+        groups.setdefault(key, []).append(q)
+    return list(groups.values())
+
+
+def _broadcast(
+    queries: List[Query],
+    groups: List[List[Query]],
+    unique: List[ReformulatedQuery],
+) -> List[ReformulatedQuery]:
+    """Copy each group's result to all of its qids, in ``queries`` order."""
+    by_qid: Dict[str, ReformulatedQuery] = {}
+    for qs, rq in zip(groups, unique):
+        for q in qs:
+            by_qid[q.qid] = rq if q.qid == rq.qid else replace(
+                rq, qid=q.qid, original=q.text, metadata=dict(rq.metadata),
+            )
+    return [by_qid[q.qid] for q in queries]
+
+
+class _Deferred(Exception):
+    """Raised by :class:`_ReplayLLM` when a response is not available yet."""
+
+
+class _ReplayLLM:
+    """Stand-in for :class:`LLMClient` used by
+    :meth:`BaseMethod.reformulate_batch_api`.
+
+    Calls are numbered per query; known responses are replayed, and an
+    unknown call is recorded as a Batch API request before the query is
+    deferred to the next round.  Calls a method issues together through
+    ``asyncio.gather`` are all recorded in the same round.
+    """
+
+    def __init__(
+        self,
+        batch: BatchLLMClient,
+        prefix: str,
+        responses: Dict[str, List[str]],
+        requests: List[Dict[str, Any]],
+    ):
+        self._batch = batch
+        self._llm = batch.llm
+        self._prefix = prefix
+        self._responses = responses
+        self._requests = requests
+        self._calls = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._llm, name)
+
+    def generate(self, messages: List[Dict[str, str]], **kwargs) -> List[str]:
+        custom_id = f"{self._prefix}:{self._calls}"
+        self._calls += 1
+        if custom_id in self._responses:
+            return self._responses[custom_id]
+        request = self._batch.make_request(custom_id, messages, **kwargs)
+        cached = self._llm.lookup_cached(request["body"])
+        if cached is not None:
+            self._responses[custom_id] = cached
+            return cached
+        self._requests.append(request)
+        raise _Deferred(custom_id)
+
+    def generate_one(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        return self.generate(messages, n=1, **kwargs)[0]
+
+    async def agenerate(self, messages: List[Dict[str, str]], **kwargs) -> List[str]:
+        return self.generate(messages, **kwargs)
+
+    async def agenerate_one(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        return self.generate(messages, n=1, **kwargs)[0]
 
+    async def aclose(self) -> None:
+        pass  # no connections of its own
@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 from typing import List, Optional
 
-from .base import BaseMethod, Query, ReformulatedQuery, _clean
+from .base import BaseMethod, Query, ReformulatedQuery, _WS_RE, _clean, _numbered
+
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+_HEADER_RE = re.compile(r"^Relevant Documents?:?\s*\n?", re.IGNORECASE | re.MULTILINE)
+_NUMBER_RE = re.compile(r"\d+[.:]\s*")
 
 
 class CSQE(BaseMethod):
@@ -21,7 +26,7 @@ class CSQE(BaseMethod):
     NAME = "csqe"
     REQUIRES_CONTEXTS = True
 
-    def reformulate_query(
+    async def areformulate_query(
         self,
         query: Query,
         contexts: Optional[List[str]] = None,
@@ -31,19 +36,22 @@ class CSQE(BaseMethod):
 
         # ── 1. Knowledge-based passages (KEQE) ──────────────────────────
         msgs_keqe = self.prompts.render("keqe", query=query.text)
-        keqe_passages = self.llm.generate(msgs_keqe, n=n_gen)
 
         # ── 2. Context-based sentence extraction (CSQE) ─────────────────
         ctxs = (contexts or [])[:ctx_k]
-        ctx_blob = "\n".join(f"{i+1}. {p}" for i, p in enumerate(ctxs))
-
+        ctx_blob = _numbered(ctxs)
         msgs_csqe = self.prompts.render("csqe", query=query.text, contexts=ctx_blob)
-        csqe_raw = self.llm.generate(msgs_csqe, n=n_gen)
+
+        # the two prompts are independent, so both requests run together
+        keqe_passages, csqe_raw = await asyncio.gather(
+            self.llm.agenerate(msgs_keqe, n=n_gen),
+            self.llm.agenerate(msgs_csqe, n=n_gen),
+        )
         csqe_sentences = [self._extract_sentences(r) for r in csqe_raw]
 
         # ── 3. Concatenate: query × n + KEQE passages + CSQE sentences ──
-        parts = [query.text] * n_gen + keqe_passages + csqe_sentences
-        reformulated = _clean(" ".join(parts)).lower()
+        expansions = " ".join(keqe_passages + csqe_sentences)
+        reformulated = _clean((query.text + " ") * n_gen + expansions).lower()
 
         return ReformulatedQuery(
             qid=query.qid,
@@ -62,17 +70,32 @@ class CSQE(BaseMethod):
     def _extract_sentences(text: str) -> str:
         """Pull quoted sentences from the CSQE response; fall back to
         numbered-document extraction."""
-        quoted = re.findall(r'"([^"]+)"', text)
+        quoted = _QUOTED_RE.findall(text)
         if quoted:
             return " ".join(quoted)
 
         # fallback: grab content after numbered markers
-        cleaned = re.sub(
-            r"^Relevant Documents?:?\s*\n?", "", text,
-            flags=re.IGNORECASE | re.MULTILINE,
-        )
-        chunks = re.findall(r"\d+[.:]\s*(.+?)(?=\d+[.:]|$)", cleaned, re.DOTALL)
+        cleaned = _HEADER_RE.sub("", text)
+        chunks = _numbered_chunks(cleaned)
         if chunks:
-            return " ".join(" ".join(c.split()) for c in chunks if c.strip())
+            return " ".join(_WS_RE.sub(" ", c).strip() for c in chunks if c.strip())
         return ""
 
+
+def _numbered_chunks(text: str) -> List[str]:
+    """Split text at "1." / "2:"-style markers, returning the (non-empty)
+    text after each marker.
+
+    A linear scan with the compiled marker pattern; a chunk extends to the
+    next marker at least one character past the previous one, as with the
+    lazy ``\\d+[.:]\\s*(.+?)(?=\\d+[.:]|$)`` regex it replaces.
+    """
+    chunks: List[str] = []
+    m = _NUMBER_RE.search(text)
+    while m:
+        nxt = _NUMBER_RE.search(text, m.end() + 1)
+        chunk = text[m.end():nxt.start() if nxt else len(text)]
+        if chunk:
+            chunks.append(chunk)
+        m = nxt
+    return chunks
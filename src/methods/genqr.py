@@ -1,4 +1,4 @@
-"""GenQR — keyword-level expansion via N independent LLM calls."""
+"""GenQR — keyword-level expansion from N sampled LLM completions."""
 
 from __future__ import annotations
 
@@ -10,8 +10,10 @@ from .base import BaseMethod, Query, ReformulatedQuery, _clean
 class GenQR(BaseMethod):
     """Generate expansion keywords through multiple independent LLM calls.
 
-    For each query the LLM is prompted ``num_calls`` times (default 5) to
-    produce comma-separated keywords.  All keyword sets are concatenated
+    For each query the LLM samples ``num_calls`` completions (default 5)
+    of comma-separated keywords, requested together with the API ``n``
+    parameter.  An optional ``temperature`` param overrides the client
+    default for these samples.  All keyword sets are concatenated
     after the original query (no query repetition).
 
     Expansion pattern: ``q + K₁ + K₂ + … + Kₙ``
@@ -21,18 +23,17 @@ class GenQR(BaseMethod):
 
     NAME = "genqr"
 
-    def reformulate_query(
+    async def areformulate_query(
         self,
         query: Query,
         contexts: Optional[List[str]] = None,
     ) -> ReformulatedQuery:
         num_calls = int(self.params.get("num_calls", 5))
 
-        all_keywords: List[str] = []
-        for _ in range(num_calls):
-            msgs = self.prompts.render("genqr", query=query.text)
-            resp = self.llm.generate_one(msgs)
-            all_keywords.append(resp)
+        msgs = self.prompts.render("genqr", query=query.text)
+        all_keywords = await self.llm.agenerate(
+            msgs, n=num_calls, temperature=self.params.get("temperature"),
+        )
 
         keyword_text = " ".join(all_keywords)
         reformulated = _clean(f"{query.text} {keyword_text}")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import List, Optional
 
 from .base import BaseMethod, Query, ReformulatedQuery
@@ -22,19 +23,17 @@ class GenQREnsemble(BaseMethod):
     NAME = "genqr_ensemble"
     NUM_INSTRUCTIONS = 10
 
-    def reformulate_query(
+    async def areformulate_query(
         self,
         query: Query,
         contexts: Optional[List[str]] = None,
     ) -> ReformulatedQuery:
         query_repeats = int(self.params.get("query_repeats", 5))
 
-        all_keywords: List[str] = []
-        for i in range(1, self.NUM_INSTRUCTIONS + 1):
-            prompt_id = f"genqr_ens_{i}"
-            msgs = self.prompts.render(prompt_id, query=query.text)
-            resp = self.llm.generate_one(msgs)
-            all_keywords.append(resp)
+        all_keywords: List[str] = list(await asyncio.gather(*(
+            self.llm.agenerate_one(self.prompts.render(f"genqr_ens_{i}", query=query.text))
+            for i in range(1, self.NUM_INSTRUCTIONS + 1)
+        )))
 
         keyword_text = " ".join(all_keywords)
         reformulated = self.concat_repeat(query.text, keyword_text, query_repeats)
@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from .base import BaseMethod, Query, ReformulatedQuery
+from ..llm_client import LLMClient
+from ..prompts import PromptBank
+from .base import BaseMethod, Query, ReformulatedQuery, _numbered
 
 
 class LameR(BaseMethod):
     """Retrieve the top-k documents for a query, then condition the LLM on
-    that evidence to produce multiple rewrites.  The expanded query
-    interleaves the original query between each generated passage.
+    that evidence to produce multiple rewrites (sampled in one request
+    with the API ``n`` parameter).  The expanded query interleaves the
+    original query between each generated passage.
 
     Reference: Wang et al., *LameR*, EMNLP 2023.
     """
@@ -18,30 +21,35 @@ class LameR(BaseMethod):
     NAME = "lamer"
     REQUIRES_CONTEXTS = True
 
-    def reformulate_query(
+    def __init__(self, llm: LLMClient, prompts: PromptBank, params: Dict[str, Any] | None = None):
+        super().__init__(llm, prompts, params)
+        self._prompt_id = self._resolve_prompt_id()
+
+    def set_dataset(self, dataset: str) -> None:
+        super().set_dataset(dataset)
+        self._prompt_id = self._resolve_prompt_id()
+
+    def _resolve_prompt_id(self) -> str:
+        """Choose the dataset-specific prompt (falls back to generic)."""
+        prompt_id = f"lamer_{self.params.get('dataset', 'msmarco')}"
+        return prompt_id if prompt_id in self.prompts else "lamer_msmarco"
+
+    async def areformulate_query(
         self,
         query: Query,
         contexts: Optional[List[str]] = None,
     ) -> ReformulatedQuery:
         num_gen = int(self.params.get("num_passages", 5))
         ctx_k = int(self.params.get("context_k", 10))
-        dataset_tag = self.params.get("dataset", "msmarco")
 
         ctxs = (contexts or [])[:ctx_k]
-        ctx_blob = "\n".join(f"{i+1}. {p}" for i, p in enumerate(ctxs))
-
-        # Choose the dataset-specific prompt (falls back to generic)
-        prompt_id = f"lamer_{dataset_tag}"
-        try:
-            self.prompts.render(prompt_id, query="test", contexts="test")
-        except KeyError:
-            prompt_id = "lamer_msmarco"
-
-        passages: List[str] = []
-        for _ in range(num_gen):
-            msgs = self.prompts.render(prompt_id, query=query.text, contexts=ctx_blob)
-            passage = self.llm.generate_one(msgs)
-            passages.append(passage.strip().strip('"').strip("'"))
+        ctx_blob = _numbered(ctxs)
+
+        msgs = self.prompts.render(self._prompt_id, query=query.text, contexts=ctx_blob)
+        generated = await self.llm.agenerate(
+            msgs, n=num_gen, temperature=self.params.get("temperature"),
+        )
+        passages = [p.strip().strip('"').strip("'") for p in generated]
 
         reformulated = self.concat_interleave(query.text, passages)
 
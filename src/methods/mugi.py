@@ -11,14 +11,16 @@ class MUGI(BaseMethod):
     """Generate multiple independent pseudo-documents and consolidate them
     into a single expanded representation.  The original query is repeated
     proportionally to the length of the generated content (adaptive
-    weighting).
+    weighting).  The pseudo-documents are sampled in one request with the
+    API ``n`` parameter; an optional ``temperature`` param overrides the
+    client default.
 
     Reference: Zhang et al., *MUGI*, SIGIR 2024.
     """
 
     NAME = "mugi"
 
-    def reformulate_query(
+    async def areformulate_query(
         self,
         query: Query,
         contexts: Optional[List[str]] = None,
@@ -26,11 +28,10 @@ class MUGI(BaseMethod):
         num_docs = int(self.params.get("num_docs", 5))
         adaptive_ratio = int(self.params.get("adaptive_ratio", 5))
 
-        pseudo_docs: List[str] = []
-        for _ in range(num_docs):
-            msgs = self.prompts.render("mugi", query=query.text)
-            doc = self.llm.generate_one(msgs)
-            pseudo_docs.append(doc)
+        msgs = self.prompts.render("mugi", query=query.text)
+        pseudo_docs = await self.llm.agenerate(
+            msgs, n=num_docs, temperature=self.params.get("temperature"),
+        )
 
         generated = " ".join(pseudo_docs)
         reformulated = self.concat_adaptive(
@@ -20,15 +20,17 @@ class _Q2DBase(BaseMethod):
 
     PROMPT_ID: str = ""  # overridden by subclasses
 
-    def reformulate_query(
+    async def areformulate_query(
         self,
         query: Query,
         contexts: Optional[List[str]] = None,
     ) -> ReformulatedQuery:
-        query_repeats = int(self.params.get("query_repeats", 5))
-
         msgs = self._build_messages(query)
-        passage = self.llm.generate_one(msgs)
+        passage = await self.llm.agenerate_one(msgs)
+        return self._expand(query, passage)
+
+    def _expand(self, query: Query, passage: str) -> ReformulatedQuery:
+        query_repeats = int(self.params.get("query_repeats", 5))
         reformulated = self.concat_repeat(query.text, passage, query_repeats)
 
         return ReformulatedQuery(
@@ -48,6 +50,11 @@ class Query2DocZS(_Q2DBase):
     NAME = "q2d_zs"
     PROMPT_ID = "q2d_zs"
 
+    async def areformulate_many(self, queries: List[Query]) -> List[ReformulatedQuery]:
+        """Generate passages for all ``queries`` in one ``q2d_zs_batched``
+        call; queries missing from the answer fall back to a single call."""
+        return await self._areformulate_packed("q2d_zs_batched", queries, self._expand)
+
 
 class Query2DocFS(_Q2DBase):
     """Few-shot Query2Doc with in-context examples."""
@@ -16,16 +16,22 @@ class Query2Keyword(BaseMethod):
 
     NAME = "q2k"
 
-    def reformulate_query(
+    async def areformulate_query(
         self,
         query: Query,
         contexts: Optional[List[str]] = None,
     ) -> ReformulatedQuery:
-        query_repeats = int(self.params.get("query_repeats", 5))
-
         msgs = self.prompts.render("q2k", query=query.text)
-        keywords = self.llm.generate_one(msgs)
+        keywords = await self.llm.agenerate_one(msgs)
+        return self._expand(query, keywords)
 
+    async def areformulate_many(self, queries: List[Query]) -> List[ReformulatedQuery]:
+        """Generate keywords for all ``queries`` in one ``q2k_batched`` call;
+        queries missing from the answer fall back to a single call."""
+        return await self._areformulate_packed("q2k_batched", queries, self._expand)
+
+    def _expand(self, query: Query, keywords: str) -> ReformulatedQuery:
+        query_repeats = int(self.params.get("query_repeats", 5))
         reformulated = self.concat_repeat(query.text, keywords, query_repeats)
 
         return ReformulatedQuery(
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-import re
-from typing import Dict, List, Optional
+from typing import List, Optional
 
-from .base import BaseMethod, Query, ReformulatedQuery, _clean
+from .base import BaseMethod, Query, ReformulatedQuery, _clean, _robust_json
 
 
 class QAExpand(BaseMethod):
@@ -14,12 +14,17 @@ class QAExpand(BaseMethod):
     (3) filter/refine answers via LLM, then concatenate retained answers
     with repeated query.
 
+    Two optional params trade fidelity to the paper for latency:
+    ``parallel_answers: true`` answers each sub-question in its own
+    concurrent call instead of one joint call, and ``refine: false``
+    skips stage 3 and keeps every non-empty answer.
+
     Reference: Jagerman et al., *QA-Expand*, 2023.
     """
 
     NAME = "qa_expand"
 
-    def reformulate_query(
+    async def areformulate_query(
         self,
         query: Query,
         contexts: Optional[List[str]] = None,
@@ -29,26 +34,37 @@ class QAExpand(BaseMethod):
 
         # ── Step 1: generate sub-questions ──────────────────────────────
         msgs_sq = self.prompts.render("qa_expand_subq", query=query.text)
-        raw_sq = self.llm.generate_one(msgs_sq)
+        raw_sq = await self.llm.agenerate_one(msgs_sq)
         subquestions = self._parse_list(raw_sq, num_subq, prefix="question")
 
         # ── Step 2: generate answers ────────────────────────────────────
-        questions_json = json.dumps(
-            {f"question{i+1}": q for i, q in enumerate(subquestions)}
-        )
-        msgs_ans = self.prompts.render("qa_expand_answer", questions=questions_json)
-        raw_ans = self.llm.generate_one(msgs_ans)
-        answers = self._parse_list(raw_ans, num_subq, prefix="answer")
+        if self.params.get("parallel_answers", False):
+            answers = list(await asyncio.gather(*(
+                self.llm.agenerate_one(
+                    self.prompts.render("qa_expand_single_answer", question=sq)
+                ) if sq.strip() else _empty()
+                for sq in subquestions
+            )))
+        else:
+            questions_json = json.dumps(
+                {f"question{i+1}": q for i, q in enumerate(subquestions)}
+            )
+            msgs_ans = self.prompts.render("qa_expand_answer", questions=questions_json)
+            raw_ans = await self.llm.agenerate_one(msgs_ans)
+            answers = self._parse_list(raw_ans, num_subq, prefix="answer")
 
         # ── Step 3: filter / refine answers ─────────────────────────────
-        answers_json = json.dumps(
-            {f"answer{i+1}": a for i, a in enumerate(answers)}
-        )
-        msgs_ref = self.prompts.render(
-            "qa_expand_refine", query=query.text, answers=answers_json
-        )
-        raw_ref = self.llm.generate_one(msgs_ref)
-        kept = self._extract_kept_answers(raw_ref, num_subq)
+        if self.params.get("refine", True):
+            answers_json = json.dumps(
+                {f"answer{i+1}": a for i, a in enumerate(answers)}
+            )
+            msgs_ref = self.prompts.render(
+                "qa_expand_refine", query=query.text, answers=answers_json
+            )
+            raw_ref = await self.llm.agenerate_one(msgs_ref)
+            kept = self._extract_kept_answers(raw_ref, num_subq)
+        else:
+            kept = list(range(num_subq))
 
         # ── Construct expanded query ────────────────────────────────────
         selected = [answers[i] for i in kept if i < len(answers)]
@@ -73,10 +89,11 @@ class QAExpand(BaseMethod):
     @staticmethod
     def _parse_list(raw: str, n: int, prefix: str) -> List[str]:
         """Try to extract a JSON dict like ``{prefix1: ..., prefix2: ...}``
-        falling back to line-split if JSON parsing fails."""
+        falling back to line-split if JSON parsing fails.  Non-string
+        values (``null``, numbers, lists) are coerced to strings."""
         try:
             data = _robust_json(raw)
-            return [data.get(f"{prefix}{i+1}", "") for i in range(n)]
+            return [str(data.get(f"{prefix}{i+1}") or "") for i in range(n)]
         except Exception:
             lines = [l.strip("-•* \t") for l in raw.splitlines() if l.strip()]
             return (lines + [""] * n)[:n]
@@ -94,15 +111,5 @@ class QAExpand(BaseMethod):
             return list(range(n))
 
 
-def _robust_json(text: str) -> Dict:
-    """Best-effort JSON extraction from LLM output."""
-    text = text.strip()
-    # strip markdown fences
-    if "```" in text:
-        parts = text.split("```")
-        text = parts[1] if len(parts) >= 2 else text
-        if text.startswith("json"):
-            text = text[4:]
-    text = text.strip()
-    return json.loads(text)
-
+async def _empty() -> str:
+    return ""
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
-import json
+import string
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+from . import fastjson
+
+# A template pre-split into ``(literal, field_name)`` pieces; ``None``
+# when the template uses format features beyond plain ``{name}`` fields.
+_Compiled = Optional[List[Tuple[str, Optional[str]]]]
 
 
 class PromptBank:
@@ -12,7 +18,8 @@ class PromptBank:
 
     The prompts file is a JSON object keyed by prompt id.  Each entry
     contains a ``messages`` list (OpenAI-style roles) with ``{variable}``
-    placeholders and optional metadata.
+    placeholders and optional metadata.  Templates are parsed once at
+    load time, so rendering is a plain join.
 
     Parameters
     ----------
@@ -21,8 +28,15 @@ class PromptBank:
     """
 
     def __init__(self, path: str | Path):
-        with open(path) as f:
-            self._bank: Dict[str, Any] = json.load(f)
+        with open(path, "rb") as f:
+            self._bank: Dict[str, Any] = fastjson.loads(f.read())
+        self._compiled: Dict[str, List[Tuple[str, str, _Compiled]]] = {
+            prompt_id: [
+                (msg["role"], msg["content"], _compile(msg["content"]))
+                for msg in entry["messages"]
+            ]
+            for prompt_id, entry in self._bank.items()
+        }
 
     def render(self, prompt_id: str, **variables) -> List[Dict[str, str]]:
         """Return an OpenAI-style message list with variables filled in.
@@ -39,19 +53,41 @@ class PromptBank:
         list[dict]
             ``[{"role": ..., "content": ...}, ...]``
         """
-        entry = self._bank.get(prompt_id)
-        if entry is None:
+        messages = self._compiled.get(prompt_id)
+        if messages is None:
             raise KeyError(f"Prompt '{prompt_id}' not found in bank.")
 
         rendered: List[Dict[str, str]] = []
-        for msg in entry["messages"]:
-            rendered.append({
-                "role": msg["role"],
-                "content": msg["content"].format(**variables),
-            })
+        for role, template, pieces in messages:
+            if pieces is None:
+                content = template.format(**variables)
+            else:
+                parts: List[str] = []
+                for literal, field in pieces:
+                    parts.append(literal)
+                    if field is not None:
+                        parts.append(str(variables[field]))
+                content = "".join(parts)
+            rendered.append({"role": role, "content": content})
         return rendered
 
+    def __contains__(self, prompt_id: str) -> bool:
+        return prompt_id in self._compiled
+
     def list_prompts(self) -> List[str]:
         """Return all available prompt ids."""
         return list(self._bank.keys())
 
+
+def _compile(template: str) -> _Compiled:
+    """Split a ``str.format`` template into literal text and field names.
+
+    Returns None (render with ``str.format``) for positional fields,
+    attribute/index lookups, conversions or format specs.
+    """
+    pieces: List[Tuple[str, Optional[str]]] = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and (not field.isidentifier() or spec or conversion):
+            return None
+        pieces.append((literal, field))
+    return pieces
@@ -2,8 +2,9 @@
 
 This module handles two distinct retrieval needs:
 
-1. **Full retrieval** (``run_retrieval``): Runs Pyserini CLI to produce
-   TREC-format run files for evaluation (top-1000).
+1. **Full retrieval** (``run_retrieval``): Produces TREC-format run files
+   for evaluation (top-1000).  BM25 is searched in-process with a cached
+   ``LuceneSearcher``; SPLADE and BGE run through the Pyserini CLI.
 2. **Context retrieval** (``retrieve_contexts_for_queries``): Uses Pyserini's
    ``LuceneSearcher`` Python API to fetch top-k passage texts at reformulation
    time.  Corpus-grounded methods (CSQE, LameR) call this to condition
@@ -12,13 +13,24 @@ This module handles two distinct retrieval needs:
 
 from __future__ import annotations
 
-import json
 import logging
+import os
 import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
-from .data import DATASETS
+from . import fastjson
+from .context_cache import ContextCache
+from .data import DATASETS, _sanitize_tsv
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
 
 logger = logging.getLogger(__name__)
 
@@ -46,9 +58,137 @@ RETRIEVER_CONFIGS = {
     },
 }
 
+_SEARCH_MODULES = {
+    "lucene": "pyserini.search.lucene",
+    "faiss": "pyserini.search.faiss",
+}
+
+# Static head of each retriever's Pyserini CLI command (module and
+# retriever-specific flags), built once; calls only append per-run values.
+_CMD_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    name: ("python", "-m", _SEARCH_MODULES[cfg["searcher"]], *cfg["extra_args"])
+    for name, cfg in RETRIEVER_CONFIGS.items()
+}
+
+# Anserini's BM25 weights, which the Pyserini CLI uses unless --k1/--b
+# are given
+_DEFAULT_BM25 = (0.9, 0.4)
+
+# In-process Lucene searchers, keyed by ``(index, k1, b)`` with the
+# weights resolved, so one index searched with the same weights is opened
+# once.  Weights are fixed per searcher rather than re-set with
+# ``set_bm25`` before each search, so full retrieval (index defaults) and
+# context retrieval (dataset weights) never change each other's scoring
+# through a shared object.  Each holds an open index in the JVM and is
+# reused for the life of the process.
+_SEARCHERS: Dict[Tuple[str, float, float], Any] = {}
+_SEARCHERS_LOCK = threading.Lock()
+
+# Queries per ``batch_search`` call
+_SEARCH_CHUNK = 1024
+
+
+def _get_searcher(index_name: str, k1: Optional[float] = None, b: Optional[float] = None):
+    """Return a cached ``LuceneSearcher`` for a prebuilt index; ``None``
+    weights mean Anserini's defaults."""
+    k1 = _DEFAULT_BM25[0] if k1 is None else k1
+    b = _DEFAULT_BM25[1] if b is None else b
+    key = (index_name, k1, b)
+    with _SEARCHERS_LOCK:
+        searcher = _SEARCHERS.get(key)
+        if searcher is None:
+            from pyserini.search.lucene import LuceneSearcher
+
+            searcher = LuceneSearcher.from_prebuilt_index(index_name)
+            searcher.set_bm25(k1=k1, b=b)
+            _prefetch_index(getattr(searcher, "index_dir", None))
+            _SEARCHERS[key] = searcher
+    return searcher
+
+
+# Index files every BM25 query reads: term index, term dictionary and
+# postings.  Positions (.pos) are not used by BM25 and stored documents
+# (.fdt, the bulk of an index) are only read for the top hits.
+_PREFETCH_SUFFIXES = (".tip", ".tim", ".doc")
+
+
+def _prefetch_index(index_dir: Optional[str | Path]) -> None:
+    """Ask the OS to start reading a freshly opened index into the page
+    cache (``POSIX_FADV_WILLNEED``), so the first queries do not stall on
+    cold random reads.  A no-op where ``posix_fadvise`` is unavailable."""
+    if index_dir is None or not hasattr(os, "posix_fadvise") or not Path(index_dir).is_dir():
+        return
+    for path in Path(index_dir).iterdir():
+        if path.suffix not in _PREFETCH_SUFFIXES:
+            continue
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _effective_threads(requested: int) -> int:
+    """Clamp a thread count to the CPUs this process may run on."""
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS / Windows
+        available = os.cpu_count() or 1
+    return max(1, min(requested, available))
+
+
+def _batch_search(
+    searcher,
+    queries: List[str],
+    qids: List[str],
+    k: int,
+    threads: int,
+) -> Dict[str, list]:
+    """``searcher.batch_search`` in chunks of :data:`_SEARCH_CHUNK` queries.
+
+    Identical query texts are searched once and their hits shared by all
+    their qids.  Chunking bounds the size of the Java result map held at
+    once, and ``threads`` is clamped to the available CPUs (more threads
+    than cores only adds contention).
+    """
+    threads = _effective_threads(threads)
+    first: Dict[str, str] = {}  # query text → the qid it is searched under
+    for qid, text in zip(qids, queries):
+        first.setdefault(text, qid)
+    texts = list(first)
+    search_qids = list(first.values())
+
+    results: Dict[str, list] = {}
+    for start in range(0, len(search_qids), _SEARCH_CHUNK):
+        end = start + _SEARCH_CHUNK
+        results.update(searcher.batch_search(
+            queries=texts[start:end], qids=search_qids[start:end], k=k, threads=threads,
+        ))
+        if len(search_qids) > _SEARCH_CHUNK:
+            logger.info("Searched %d/%d queries", min(end, len(search_qids)), len(search_qids))
+
+    if len(search_qids) < len(qids):
+        results = {qid: results.get(first[text], []) for qid, text in zip(qids, queries)}
+    return results
+
+
+def _clear_searcher_cache() -> None:
+    """Drop all cached searchers (releasing their JVM references)."""
+    with _SEARCHERS_LOCK:
+        for searcher in _SEARCHERS.values():
+            close = getattr(searcher, "close", None)
+            if close is not None:
+                close()
+        _SEARCHERS.clear()
+
 
 def run_retrieval(
-    queries_tsv: str | Path,
+    queries_tsv: str | Path | List[Tuple[str, str]],
     dataset: str,
     retriever: str,
     output_run: str | Path,
@@ -58,12 +198,19 @@ def run_retrieval(
     remove_query: bool = False,
     query_prefix: str = "",
 ) -> Path:
-    """Run a retrieval experiment using Pyserini's CLI.
+    """Run a retrieval experiment with Pyserini.
+
+    Plain BM25 runs search in-process, reusing a cached searcher (no
+    JVM start-up per call); other retrievers run Pyserini's CLI.  Both
+    paths write the same run format.
 
     Parameters
     ----------
-    queries_tsv : path
-        TSV file with ``qid \\t query`` rows.
+    queries_tsv : path or list of (qid, text)
+        TSV file with ``qid \\t query`` rows, or the queries themselves
+        (e.g. fresh reformulations).  In-memory queries are searched
+        directly in-process, or handed to the CLI through a temporary
+        file in RAM-backed ``/dev/shm`` when available.
     dataset : str
         Dataset name (key in :data:`DATASETS`).
     retriever : str
@@ -84,26 +231,112 @@ def run_retrieval(
     Path
         The ``output_run`` path.
     """
+    return _start_retrieval(
+        queries_tsv, dataset, retriever, output_run,
+        hits, threads, batch_size, remove_query, query_prefix,
+    )()
+
+
+def run_retrieval_many(jobs: List[Dict[str, Any]]) -> List[Path]:
+    """Run several retrievals concurrently.
+
+    Each job is a dict of :func:`run_retrieval` keyword arguments.  CLI
+    retrievers are launched as parallel processes first, and in-process
+    BM25 searches while they run.  Each job's ``threads`` is divided by the
+    number of jobs so the concurrent searches do not oversubscribe the CPU.
+
+    Returns
+    -------
+    list[Path]
+        The run files, in job order.
+
+    Raises
+    ------
+    RuntimeError
+        If any job failed, once all jobs have finished (the run files of
+        the successful jobs are still written).
+    """
+    order = sorted(range(len(jobs)), key=lambda i: _runs_in_process(**jobs[i]))
+    waits: Dict[int, Any] = {}
+    errors: List[str] = []
+    for i in order:
+        job = dict(jobs[i])
+        job["threads"] = max(1, job.get("threads", 16) // len(jobs))
+        try:
+            waits[i] = _start_retrieval(**job)
+        except Exception as e:
+            errors.append(f"{job['retriever']}: {e}")
+
+    paths: List[Path] = []
+    for i in sorted(waits):
+        try:
+            paths.append(waits[i]())
+        except Exception as e:
+            errors.append(f"{jobs[i]['retriever']}: {e}")
+    if errors:
+        raise RuntimeError("\n".join(errors))
+    return paths
+
+
+def _runs_in_process(
+    retriever: str,
+    remove_query: bool = False,
+    query_prefix: str = "",
+    **_: Any,
+) -> bool:
+    return retriever == "bm25" and not remove_query and not query_prefix
+
+
+def _start_retrieval(
+    queries_tsv: str | Path | List[Tuple[str, str]],
+    dataset: str,
+    retriever: str,
+    output_run: str | Path,
+    hits: int = 1000,
+    threads: int = 16,
+    batch_size: int = 512,
+    remove_query: bool = False,
+    query_prefix: str = "",
+) -> Callable[[], Path]:
+    """Start one retrieval and return a function that waits for it.
+
+    In-process searches finish before this returns; CLI runs are left
+    running in the background until the returned function is called.
+    """
     ds_cfg = DATASETS[dataset]
     ret_cfg = RETRIEVER_CONFIGS[retriever]
-    index_name = ds_cfg[ret_cfg["index_key"]]
+    index_name = getattr(ds_cfg, ret_cfg["index_key"])
     output_run = Path(output_run)
     output_run.parent.mkdir(parents=True, exist_ok=True)
 
-    if ret_cfg["searcher"] == "faiss":
-        module = "pyserini.search.faiss"
-    else:
-        module = "pyserini.search.lucene"
+    if _runs_in_process(retriever, remove_query, query_prefix):
+        print(f"  [{retriever.upper()}] Running retrieval on {dataset} (in-process) …")
+        searcher = _get_searcher(index_name)
+        queries = (
+            list(_read_tsv(queries_tsv)) if isinstance(queries_tsv, (str, Path))
+            else _clean_queries(queries_tsv)
+        )
+        qids = [qid for qid, _ in queries]
+        results = _batch_search(
+            searcher, [text for _, text in queries], qids, k=hits, threads=threads,
+        )
+        _write_trec_run(results, qids, output_run)
+        print(f"  [{retriever.upper()}] Done → {output_run}")
+        return lambda: output_run
+
+    temp_topics: Optional[Path] = None
+    if not isinstance(queries_tsv, (str, Path)):
+        queries_tsv = temp_topics = _write_temp_topics(queries_tsv)
 
     cmd = [
-        "python", "-m", module,
-        "--threads", str(threads),
+        *_CMD_TEMPLATES[retriever],
+        "--threads", str(_effective_threads(threads)),
         "--batch-size", str(batch_size),
         "--index", index_name,
         "--topics", str(queries_tsv),
         "--output", str(output_run),
         "--hits", str(hits),
-    ] + ret_cfg["extra_args"]
+    ]
 
     if query_prefix:
         cmd.extend(["--query-prefix", query_prefix])
@@ -111,13 +344,69 @@ def run_retrieval(
         cmd.append("--remove-query")
 
     print(f"  [{retriever.upper()}] Running retrieval on {dataset} …")
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=7200)
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"Retrieval failed (exit {result.returncode}):\n{result.stderr[:1000]}"
+    # stderr is drained line by line in the background (an unread pipe
+    # would stall the process); only the tail is kept for error reports
+    try:
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, errors="replace", bufsize=1,
         )
-    print(f"  [{retriever.upper()}] Done → {output_run}")
-    return output_run
+    except BaseException:
+        if temp_topics is not None:
+            temp_topics.unlink(missing_ok=True)
+        raise
+    tail: Deque[str] = deque(maxlen=200)
+    tag = retriever.upper()
+
+    def drain() -> None:
+        for line in proc.stderr:
+            line = line.rstrip()
+            logger.info("[%s] %s", tag, line)
+            tail.append(line)
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    deadline = time.monotonic() + 7200
+
+    def wait() -> Path:
+        try:
+            returncode = proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            reader.join()
+            if temp_topics is not None:
+                temp_topics.unlink(missing_ok=True)
+        if returncode != 0:
+            message = "\n".join(tail)
+            raise RuntimeError(f"Retrieval failed (exit {returncode}):\n{message}")
+        print(f"  [{tag}] Done → {output_run}")
+        return output_run
+
+    return wait
+
+
+def _write_temp_topics(queries: List[Tuple[str, str]]) -> Path:
+    """Write ``(qid, text)`` pairs to a temporary TSV for the Pyserini CLI,
+    in RAM-backed ``/dev/shm`` when it exists.  The caller deletes it."""
+    tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    fd, name = tempfile.mkstemp(prefix="queries_", suffix=".tsv", dir=tmp_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write("".join(f"{qid}\t{_sanitize_tsv(text)}\n" for qid, text in queries))
+    return Path(name)
+
+
+def _clean_queries(queries: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """In-memory queries as :func:`_read_tsv` would return them after a
+    round trip through :func:`~src.data.save_queries_tsv`."""
+    cleaned = []
+    for qid, text in queries:
+        qid, tab, text = f"{qid}\t{_sanitize_tsv(text)}".strip().partition("\t")
+        if tab:
+            cleaned.append((qid, text))
+    return cleaned
 
 
 # ── Context retrieval for corpus-grounded methods ─────────────────────────────
@@ -137,17 +426,10 @@ def _extract_passage_text(hit) -> str:
     raw = doc.get("raw")
     if raw:
         try:
-            parsed = json.loads(raw)
-            # MS MARCO: {"id": "...", "contents": "passage text"}
-            if "contents" in parsed:
-                return parsed["contents"].strip()
-            # Some indexes use "body" or "text"
-            for key in ("body", "text", "passage"):
-                if key in parsed:
-                    return parsed[key].strip()
+            text = _raw_doc_text(raw)
             # Fall back to the full raw string if no known key
-            return raw.strip()
-        except (json.JSONDecodeError, TypeError):
+            return text.strip() if text is not None else raw.strip()
+        except (ValueError, TypeError):
             return raw.strip()
 
     # Try "contents" field directly (BEIR-style flat indexes)
@@ -158,12 +440,71 @@ def _extract_passage_text(hit) -> str:
     return ""
 
 
+def _extract_msmarco_text(hit) -> str:
+    """Fast path for MS MARCO indexes, whose ``raw`` field is always
+    ``{"id": ..., "contents": ...}``; anything else takes the generic path."""
+    raw = hit.lucene_document.get("raw")
+    try:
+        return _raw_doc_contents(raw).strip()
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return _extract_passage_text(hit)
+
+
+# Keys that may hold the passage text in a ``raw`` JSON field, in order of
+# preference.  MS MARCO: {"id": "...", "contents": "passage text"}; some
+# indexes use "body" or "text".
+_RAW_TEXT_KEYS = ("contents", "body", "text", "passage")
+
+if msgspec is not None:
+    class _RawDoc(msgspec.Struct):
+        """The text keys of a ``raw`` field; other keys are skipped unparsed."""
+
+        contents: Optional[str] = None
+        body: Optional[str] = None
+        text: Optional[str] = None
+        passage: Optional[str] = None
+
+    _decode_raw_doc = msgspec.json.Decoder(_RawDoc).decode
+
+    def _raw_doc_text(raw: str) -> Optional[str]:
+        doc = _decode_raw_doc(raw)
+        for key in _RAW_TEXT_KEYS:
+            value = getattr(doc, key)
+            if value is not None:
+                return value
+        return None
+
+    def _raw_doc_contents(raw: str) -> str:
+        contents = _decode_raw_doc(raw).contents
+        if contents is None:
+            raise KeyError("contents")
+        return contents
+else:
+    def _raw_doc_text(raw: str) -> Optional[str]:
+        parsed = fastjson.loads(raw)
+        for key in _RAW_TEXT_KEYS:
+            if key in parsed:
+                return parsed[key]
+        return None
+
+    def _raw_doc_contents(raw: str) -> str:
+        return fastjson.loads(raw)["contents"]
+
+
+# Document-text extractor per dataset group; groups without a fixed
+# stored-document layout use :func:`_extract_passage_text`.
+_EXTRACTORS = {
+    "trec": _extract_msmarco_text,
+}
+
+
 def retrieve_contexts_for_queries(
     queries_tsv: str | Path,
     dataset: str,
     retriever: str = "bm25",
     k: int = 10,
     threads: int = 16,
+    cache_dir: Optional[str | Path] = None,
 ) -> Dict[str, List[str]]:
     """Retrieve top-*k* passage texts for each query via BM25.
 
@@ -172,7 +513,8 @@ def retrieve_contexts_for_queries(
 
     The searcher is configured with the dataset-specific BM25 weights
     (k1, b) from the dataset registry so context retrieval is consistent
-    with the paper's experimental setup.
+    with the paper's experimental setup.  It is cached per ``(index, k1, b)``,
+    so repeated calls in one process reuse the open index.
 
     Parameters
     ----------
@@ -186,18 +528,21 @@ def retrieve_contexts_for_queries(
         Number of top passages to retrieve per query (default 10).
     threads : int
         Thread count for batch search.
+    cache_dir : path, optional
+        If given, contexts are cached on disk per (index, k1, b, k, query
+        text) and only uncached queries are searched; when every query is
+        cached the index is not opened at all.
 
     Returns
     -------
     dict[str, list[str]]
         Mapping ``qid → [passage_text_1, …, passage_text_k]``.
     """
-    from pyserini.search.lucene import LuceneSearcher
-
     ds_cfg = DATASETS[dataset]
-    index_name = ds_cfg["index_bm25"]
-    bm25_k1 = ds_cfg.get("bm25_k1", 0.9)
-    bm25_b = ds_cfg.get("bm25_b", 0.4)
+    index_name = ds_cfg.index_bm25
+    bm25_k1 = ds_cfg.bm25_k1
+    bm25_b = ds_cfg.bm25_b
+    extract = _EXTRACTORS.get(ds_cfg.group, _extract_passage_text)
 
     logger.info(
         "Context retrieval: index=%s  k1=%.2f  b=%.2f  top_k=%d",
@@ -208,38 +553,72 @@ def retrieve_contexts_for_queries(
         f"(index={index_name}, k1={bm25_k1}, b={bm25_b}) …"
     )
 
-    # Initialise searcher with dataset-specific BM25 weights
-    searcher = LuceneSearcher.from_prebuilt_index(index_name)
-    searcher.set_bm25(k1=bm25_k1, b=bm25_b)
-
-    queries = _read_tsv(queries_tsv)
-
-    # Batch search for efficiency (Pyserini's Java backend parallelises this)
-    query_texts = [text for _, text in queries]
-    query_ids = [qid for qid, _ in queries]
-
-    results = searcher.batch_search(
-        queries=query_texts,
-        qids=query_ids,
-        k=k,
-        threads=threads,
-    )
+    queries = list(_read_tsv(queries_tsv))
 
+    cache = ContextCache(cache_dir) if cache_dir is not None else None
+    keys: Dict[str, str] = {}
     ctx_map: Dict[str, List[str]] = {}
-    for qid in query_ids:
-        hits = results.get(qid, [])
-        ctx_map[qid] = [_extract_passage_text(h) for h in hits]
-
+    if cache is not None:
+        keys = {
+            qid: ContextCache.make_key(index_name, bm25_k1, bm25_b, k, text)
+            for qid, text in queries
+        }
+        cached = cache.get_many(list(set(keys.values())))
+        ctx_map = {qid: cached[key] for qid, key in keys.items() if key in cached}
+        if ctx_map:
+            print(f"  [CTX] {len(ctx_map)}/{len(queries)} queries served from cache")
+    to_search = [(qid, text) for qid, text in queries if qid not in ctx_map]
+
+    if to_search:
+        # Searcher with dataset-specific BM25 weights, kept open for later calls
+        searcher = _get_searcher(index_name, bm25_k1, bm25_b)
+
+        # Batch search for efficiency (Pyserini's Java backend parallelises this)
+        query_texts = [text for _, text in to_search]
+        query_ids = [qid for qid, _ in to_search]
+
+        results = _batch_search(searcher, query_texts, query_ids, k=k, threads=threads)
+
+        # Result lists of different queries overlap, so each document's text
+        # is extracted (JSON-parsed) once and shared.
+        text_by_docid: Dict[str, str] = {}
+        for qid in query_ids:
+            texts = []
+            for h in results.get(qid, []):
+                text = text_by_docid.get(h.docid)
+                if text is None:
+                    text = text_by_docid[h.docid] = extract(h)
+                texts.append(text)
+            ctx_map[qid] = texts
+
+        if cache is not None:
+            cache.set_many((keys[qid], ctx_map[qid]) for qid in query_ids)
+
+    ctx_map = {qid: ctx_map[qid] for qid, _ in queries}
     print(f"  [CTX] Retrieved contexts for {len(ctx_map)} queries")
     return ctx_map
 
 
-def _read_tsv(path):
-    pairs = []
-    with open(path, encoding="utf-8") as f:
+def _write_trec_run(results, qids: List[str], path: str | Path, tag: str = "Anserini") -> None:
+    """Write ``batch_search`` results as a TREC run (Pyserini CLI format)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # one generator over every hit into a 1 MiB buffer: a handful of large
+    # writes instead of one per query (or per hit)
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.writelines(
+            f"{qid} Q0 {h.docid} {rank} {h.score:.6f} {tag}\n"
+            for qid in qids
+            for rank, h in enumerate(results.get(qid, []), start=1)
+        )
+
+
+def _read_tsv(path) -> Iterator[Tuple[str, str]]:
+    """Yield ``(qid, text)`` pairs from the whitespace-stripped lines,
+    skipping lines without a tab-separated query."""
+    with open(path, encoding="utf-8", buffering=1 << 20) as f:
         for line in f:
-            parts = line.strip().split("\t", 1)
-            if len(parts) == 2:
-                pairs.append((parts[0], parts[1]))
-    return pairs
+            qid, tab, text = line.strip().partition("\t")
+            if tab:
+                yield qid, text
 